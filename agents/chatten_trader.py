@@ -5,38 +5,58 @@ A SpoonOS-powered AI agent that acts as a Liquidity Manager for the
 Compute Token DEX on Neo N3 blockchain.
 """
 
-from typing import Any, Optional
+import asyncio
+import textwrap
+import time
+from collections import deque
+from types import MappingProxyType
+from typing import Any, ClassVar, Mapping, Optional
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import datetime, timezone
+
+import httpx
 
 # SpoonOS SDK imports
 # Note: These imports will show "could not be resolved" warnings in IDE
 # until spoon-ai-sdk is installed. This is expected during development.
+# Only the agent base class is imported: it must be resolved when the class
+# body below is executed, while the rest of the SDK (memory backends, config
+# models) is never used here and would only add to import time.
 _SPOON_SDK_AVAILABLE = False
 try:
-    from spoon_ai_sdk import ToolCallAgent, Tool, AgentConfig  # type: ignore
-    from spoon_ai_sdk.memory import ConversationMemory  # type: ignore
+    from spoon_ai_sdk import ToolCallAgent  # type: ignore
     _SPOON_SDK_AVAILABLE = True
 except ImportError:
     # Fallback for development/scaffolding
     ToolCallAgent = object
-    Tool = object
-    AgentConfig = object
-    ConversationMemory = object
 
 
-@dataclass
+@dataclass(slots=True)
 class MarketState:
     """Represents the current state of the Compute Token market."""
     
+    # Number of most recent prices kept in price_history
+    HISTORY_CAPACITY: ClassVar[int] = 4096
+    
     total_liquidity: float = 0.0
     current_q_score: float = 0.0
     active_orders: int = 0
-    last_trade_timestamp: Optional[str] = None
-    price_history: list[float] = field(default_factory=list)
+    last_trade_ns: int = 0
+    price_history: deque[float] = field(
+        default_factory=lambda: deque(maxlen=MarketState.HISTORY_CAPACITY)
+    )
+    
+    @property
+    def last_trade_timestamp(self) -> Optional[str]:
+        """ISO-8601 UTC time of the last trade, formatted on read."""
+        if not self.last_trade_ns:
+            return None
+        return datetime.fromtimestamp(
+            self.last_trade_ns / 1e9, tz=timezone.utc
+        ).isoformat()
 
 
-@dataclass 
+@dataclass(slots=True)
 class TokenPosition:
     """Represents the agent's token holdings."""
     
@@ -46,6 +66,37 @@ class TokenPosition:
     available_amount: float = 0.0
 
 
+# Shared, read-only tx placeholder for orders without an on-chain transfer
+_SIMULATED_TX: Mapping[str, Any] = MappingProxyType({"simulated": True})
+
+
+@dataclass(slots=True, frozen=True)
+class TradeResult:
+    """Outcome of a buy or sell order."""
+    
+    action: str
+    token_id: str
+    filled: float
+    unit_price: float
+    notional: float
+    tx: Mapping[str, Any]
+    
+    def as_dict(self) -> dict[str, Any]:
+        """
+        Serialize to the JSON-friendly order dict.
+        
+        The notional is reported as "spent" for buys and "received" for sells.
+        """
+        return {
+            "action": self.action,
+            "token_id": self.token_id,
+            "filled": self.filled,
+            "unit_price": self.unit_price,
+            "spent" if self.action == "buy" else "received": self.notional,
+            "tx": dict(self.tx),
+        }
+
+
 class ChattenTraderAgent(ToolCallAgent):
     """
     Liquidity Manager Agent for the Chatten Compute Token DEX.
@@ -63,8 +114,8 @@ class ChattenTraderAgent(ToolCallAgent):
         position: The agent's current token holdings
     """
     
-    # System prompt defining the agent's persona
-    SYSTEM_PROMPT = """
+    # System prompt defining the agent's persona (dedented once at class creation)
+    SYSTEM_PROMPT = textwrap.dedent("""
     You are the Chatten Liquidity Manager, an autonomous AI agent operating on the 
     Neo N3 blockchain. Your primary role is to manage the Compute Token DEX, ensuring 
     efficient market operations for AI model capacity trading.
@@ -90,7 +141,18 @@ class ChattenTraderAgent(ToolCallAgent):
     
     You have access to Neo N3 blockchain tools for reading balances, executing transfers, 
     and interacting with the Chatten NEP-11 smart contract.
-    """
+    """).strip()
+    
+    # Seconds a Q-score stays reusable for back-to-back orders on one token
+    Q_SCORE_CACHE_TTL = 2.0
+    
+    # Well-known tool names and the attributes they are resolved into
+    _TOOL_SLOTS = {
+        "neo_bridge": "_tool_neo_bridge",
+        "token_balance": "_tool_balance",
+        "token_transfer": "_tool_transfer",
+        "q_score_analyzer": "_tool_q_score",
+    }
     
     def __init__(
         self,
@@ -124,6 +186,12 @@ class ChattenTraderAgent(ToolCallAgent):
         self.market_state = MarketState()
         self.position = TokenPosition()
         self.tools: dict[str, Any] = {}
+        self._tool_neo_bridge: Any = None
+        self._tool_balance: Any = None
+        self._tool_transfer: Any = None
+        self._tool_q_score: Any = None
+        self._q_score_cache: dict[str, tuple[float, float]] = {}
+        self._http_session: Optional[httpx.AsyncClient] = None
         
         # Initialize tools (to be registered)
         self._register_tools(tools or {})
@@ -138,6 +206,9 @@ class ChattenTraderAgent(ToolCallAgent):
         Attach a tool to the agent and register with SpoonOS when available.
         """
         self.tools[name] = tool
+        slot = self._TOOL_SLOTS.get(name)
+        if slot is not None:
+            setattr(self, slot, tool)
         if _SPOON_SDK_AVAILABLE:
             try:
                 super().register_tool(tool)  # type: ignore[attr-defined]
@@ -168,7 +239,7 @@ class ChattenTraderAgent(ToolCallAgent):
             ConnectionError: If unable to connect to Neo N3 RPC node
             ValueError: If the token_id is invalid
         """
-        balance_tool = self.tools.get("token_balance")
+        balance_tool = self._tool_balance
         if balance_tool is None:
             raise NotImplementedError("TokenBalanceTool is not configured")
         
@@ -177,11 +248,12 @@ class ChattenTraderAgent(ToolCallAgent):
         tokens = await balance_tool.get_tokens(address)
         selected_token = token_id or (tokens[0] if tokens else "")
         
-        self.position.token_id = selected_token
-        self.position.balance = float(balance)
-        self.position.available_amount = max(
-            0.0, self.position.balance - self.position.locked_amount
-        )
+        position = self.position
+        balance = float(balance)
+        locked = position.locked_amount
+        position.token_id = selected_token
+        position.balance = balance
+        position.available_amount = balance - locked if balance > locked else 0.0
         
         return self.position
     
@@ -192,26 +264,28 @@ class ChattenTraderAgent(ToolCallAgent):
         Returns:
             dict: Mapping of token_id to TokenPosition for all held tokens
         """
-        balance_tool = self.tools.get("token_balance")
+        balance_tool = self._tool_balance
         if balance_tool is None:
             raise NotImplementedError("TokenBalanceTool is not configured")
         
         address = self.neo_wallet_address or ""
-        token_ids = await balance_tool.get_tokens(address)
+        # Token listing and the (batched) balance query are independent
+        token_ids, balances = await asyncio.gather(
+            balance_tool.get_tokens(address),
+            balance_tool.get_balances([address]),
+        )
+        # Coerce once; every position shares the same wallet balance
+        balance = float(balances[0])
         
-        positions: dict[str, TokenPosition] = {}
-        for t_id in token_ids:
-            info = await balance_tool.get_token_info(t_id)
-            balance = await balance_tool.get_balance(address)
-            pos = TokenPosition(
+        return {
+            t_id: TokenPosition(
                 token_id=t_id,
-                balance=float(balance),
+                balance=balance,
                 locked_amount=0.0,
-                available_amount=float(balance),
+                available_amount=balance,
             )
-            positions[t_id] = pos
-        
-        return positions
+            for t_id in token_ids
+        }
     
     # =========================================================================
     # MARKET QUALITY ANALYSIS (Q-SCORE)
@@ -245,7 +319,7 @@ class ChattenTraderAgent(ToolCallAgent):
             ValueError: If model_id is not registered on-chain
             TimeoutError: If performance data cannot be retrieved in time
         """
-        analyzer = self.tools.get("q_score_analyzer")
+        analyzer = self._tool_q_score
         if analyzer is None:
             raise NotImplementedError("QScoreAnalyzerTool is not configured")
         
@@ -260,23 +334,22 @@ class ChattenTraderAgent(ToolCallAgent):
         Returns:
             dict: Mapping of model_id to their current Q-scores
         """
-        analyzer = self.tools.get("q_score_analyzer")
+        analyzer = self._tool_q_score
         if analyzer is None:
             raise NotImplementedError("QScoreAnalyzerTool is not configured")
         
-        # Use cached metrics if available; otherwise calculate a couple of demo IDs
-        model_ids = list(getattr(analyzer, "_metrics_cache", {}).keys()) or [
+        # Use cached metrics if available; otherwise calculate a couple of demo IDs.
+        # Snapshot the view: scoring below may add entries to the cache.
+        model_ids = list(analyzer.cached_model_ids()) or [
             "model-alpha",
             "model-beta",
             "model-gamma",
         ]
         
-        scores = {}
-        for model_id in model_ids:
-            result = await analyzer.calculate_q_score(model_id)
-            scores[model_id] = result.q_score
-        
-        return scores
+        results = await asyncio.gather(
+            *(analyzer.calculate_q_score(model_id) for model_id in model_ids)
+        )
+        return {model_id: r.q_score for model_id, r in zip(model_ids, results)}
     
     async def compare_q_scores(
         self,
@@ -290,14 +363,17 @@ class ChattenTraderAgent(ToolCallAgent):
             
         Returns:
             list: Sorted list of (model_id, q_score, recommendation) tuples
+        
+        The analyzer already returns results ranked highest first, so they
+        are mapped to tuples without sorting again.
         """
-        analyzer = self.tools.get("q_score_analyzer")
+        analyzer = self._tool_q_score
         if analyzer is None:
             raise NotImplementedError("QScoreAnalyzerTool is not configured")
         
         results = await analyzer.compare_models(model_ids)
         return [
-            (r.model_id, r.q_score, r.recommendations[0] if r.recommendations else "")
+            (r.model_id, r.q_score, (r.recommendations or ("",))[0])
             for r in results
         ]
     
@@ -310,7 +386,7 @@ class ChattenTraderAgent(ToolCallAgent):
         token_id: str,
         amount: float,
         max_price: Optional[float] = None
-    ) -> dict[str, Any]:
+    ) -> TradeResult:
         """
         Execute a buy order for Compute Tokens.
         
@@ -320,14 +396,13 @@ class ChattenTraderAgent(ToolCallAgent):
             max_price: Maximum price willing to pay (slippage protection)
             
         Returns:
-            dict: Transaction result including tx_hash and filled amount
+            TradeResult: Fill details and the transfer transaction result
         """
-        q_score = await self.analyze_q_score(token_id)
-        unit_price = max_price or self._price_from_q_score(q_score)
+        unit_price = await self._resolve_unit_price(token_id, max_price)
         filled = float(amount)
         
         tx_result: dict[str, Any] = {}
-        transfer_tool = self.tools.get("token_transfer")
+        transfer_tool = self._tool_transfer
         if transfer_tool:
             tx_result = await transfer_tool.transfer(
                 self.neo_wallet_address or "",
@@ -335,24 +410,24 @@ class ChattenTraderAgent(ToolCallAgent):
                 data=None
             )
         
-        self.market_state.last_trade_timestamp = datetime.utcnow().isoformat()
+        self.market_state.last_trade_ns = time.time_ns()
         self.market_state.active_orders += 1
         
-        return {
-            "action": "buy",
-            "token_id": token_id,
-            "filled": filled,
-            "unit_price": unit_price,
-            "spent": filled * unit_price,
-            "tx": tx_result or {"simulated": True},
-        }
+        return TradeResult(
+            action="buy",
+            token_id=token_id,
+            filled=filled,
+            unit_price=unit_price,
+            notional=filled * unit_price,
+            tx=tx_result or _SIMULATED_TX,
+        )
     
     async def execute_sell_order(
         self,
         token_id: str,
         amount: float,
         min_price: Optional[float] = None
-    ) -> dict[str, Any]:
+    ) -> TradeResult:
         """
         Execute a sell order for Compute Tokens.
         
@@ -362,14 +437,13 @@ class ChattenTraderAgent(ToolCallAgent):
             min_price: Minimum price to accept (slippage protection)
             
         Returns:
-            dict: Transaction result including tx_hash and filled amount
+            TradeResult: Fill details and the transfer transaction result
         """
-        q_score = await self.analyze_q_score(token_id)
-        unit_price = min_price or self._price_from_q_score(q_score)
+        unit_price = await self._resolve_unit_price(token_id, min_price)
         filled = float(amount)
         
         tx_result: dict[str, Any] = {}
-        transfer_tool = self.tools.get("token_transfer")
+        transfer_tool = self._tool_transfer
         if transfer_tool:
             tx_result = await transfer_tool.transfer(
                 self.neo_wallet_address or "",
@@ -377,56 +451,125 @@ class ChattenTraderAgent(ToolCallAgent):
                 data=None
             )
         
-        self.market_state.last_trade_timestamp = datetime.utcnow().isoformat()
+        self.market_state.last_trade_ns = time.time_ns()
         self.market_state.active_orders += 1
         
-        return {
-            "action": "sell",
-            "token_id": token_id,
-            "filled": filled,
-            "unit_price": unit_price,
-            "received": filled * unit_price,
-            "tx": tx_result or {"simulated": True},
-        }
+        return TradeResult(
+            action="sell",
+            token_id=token_id,
+            filled=filled,
+            unit_price=unit_price,
+            notional=filled * unit_price,
+            tx=tx_result or _SIMULATED_TX,
+        )
+
+    async def _resolve_unit_price(
+        self,
+        token_id: str,
+        explicit_price: Optional[float]
+    ) -> float:
+        """
+        Use the caller's limit price if given, otherwise price from the Q-score.
+        
+        A non-positive limit (e.g. min_price=0.0) means "no limit", as it
+        did before limit prices skipped the Q-score lookup.
+        """
+        if explicit_price is not None and explicit_price > 0:
+            return explicit_price
+        return self._price_from_q_score(await self._cached_q_score(token_id))
+    
+    async def _cached_q_score(self, token_id: str) -> float:
+        """
+        Return a recent Q-score for the token, re-analyzing once it is stale.
+        """
+        now = time.monotonic()
+        cached = self._q_score_cache.get(token_id)
+        if cached is not None and now - cached[1] < self.Q_SCORE_CACHE_TTL:
+            return cached[0]
+        
+        q_score = await self.analyze_q_score(token_id)
+        self._q_score_cache[token_id] = (q_score, now)
+        return q_score
 
     def _price_from_q_score(self, q_score: float) -> float:
         """
         Simple pricing heuristic that rewards higher Q-scores with higher prices.
         """
-        normalized = max(0.0, min(1.0, q_score / 100))
+        # Inline clamp to [0, 1]; avoids the max()/min() builtin calls. The
+        # upper bound goes first, as in max(0.0, min(1.0, x)), so NaN maps to 1.0
+        normalized = q_score / 100
+        normalized = normalized if normalized < 1.0 else 1.0
+        normalized = normalized if normalized > 0.0 else 0.0
         return round(0.1 + normalized * 0.9, 4)
     
+    def price_book(self, q_scores: dict[str, float]) -> dict[str, float]:
+        """
+        Price a whole book of Q-scores (e.g. from get_market_q_scores).
+        
+        Args:
+            q_scores: Mapping of model_id to Q-score
+            
+        Returns:
+            dict: Mapping of model_id to unit price
+        """
+        price = self._price_from_q_score
+        return {model_id: price(q_score) for model_id, q_score in q_scores.items()}
+    
     # =========================================================================
     # AGENT LIFECYCLE
     # =========================================================================
     
     async def on_start(self) -> None:
         """Called when the agent starts. Initialize connections and state."""
-        neo_bridge = self.tools.get("neo_bridge")
+        # One pooled HTTP client shared by every tool for the agent's lifetime
+        if self._http_session is None:
+            self._http_session = httpx.AsyncClient(
+                timeout=10.0,
+                limits=httpx.Limits(max_connections=32, max_keepalive_connections=32),
+            )
+        for tool in self.tools.values():
+            if hasattr(tool, "set_session"):
+                await tool.set_session(self._http_session)
+        
+        neo_bridge = self._tool_neo_bridge
         if neo_bridge:
             connected = await neo_bridge.connect()
             if not connected:
                 raise ConnectionError("Unable to connect to Neo RPC node")
         
-        # Prime market state with a sample Q-score
-        analyzer = self.tools.get("q_score_analyzer")
+        # Priming the Q-score and syncing the wallet balance are independent,
+        # so run whichever of them applies concurrently once the bridge is up
+        startup = {}
+        analyzer = self._tool_q_score
         if analyzer:
-            result = await analyzer.calculate_q_score("model-alpha")
-            self.market_state.current_q_score = result.q_score
-        
-        # Sync balances for the configured wallet
+            startup["q_score"] = analyzer.calculate_q_score("model-alpha")
         if self.neo_wallet_address:
-            try:
-                await self.check_token_balance()
-            except Exception:
-                # Non-fatal during demo bootstrap
-                pass
+            startup["balance"] = self.check_token_balance()
+        results = dict(zip(
+            startup,
+            await asyncio.gather(*startup.values(), return_exceptions=True),
+        ))
+        for name, result in results.items():
+            if isinstance(result, BaseException):
+                print(f"[ChattenTrader] Startup {name} sync failed: {result!r}")
+        
+        # Prime market state with a sample Q-score; a balance sync failure
+        # is non-fatal during bootstrap
+        prime_result = results.get("q_score")
+        if isinstance(prime_result, BaseException):
+            raise prime_result
+        if prime_result is not None:
+            self.market_state.current_q_score = prime_result.q_score
     
     async def on_stop(self) -> None:
         """Called when the agent stops. Clean up resources."""
-        neo_bridge = self.tools.get("neo_bridge")
+        neo_bridge = self._tool_neo_bridge
         if neo_bridge and hasattr(neo_bridge, "disconnect"):
             await neo_bridge.disconnect()
+        
+        if self._http_session is not None:
+            await self._http_session.aclose()
+            self._http_session = None
 
 
 # Convenience function for quick agent instantiation
@@ -8,7 +8,7 @@ A Hyperledger-style Compute Finance Protocol on Neo N3.
 Compiler: neo3-boa v1.4.x
 """
 
-from typing import Any, cast
+from typing import Any, List, cast
 
 # =============================================================================
 # NEO3-BOA v1.4.x IMPORTS
@@ -26,13 +26,19 @@ from boa3.sc.contracts import GasToken, CryptoLib, ContractManagement  # type: i
 # STORAGE PREFIXES
 # =============================================================================
 
+# Layout: 0x0? token accounting, 0x1? access control, 0x2? market.
+# Balance keys are owner-major (prefix + owner + token_id): per-owner reads
+# (tokensOf, balance checks on every move) dominate, so an owner's holdings
+# sort contiguously and find() scans only them.
 PREFIX_BALANCE = b'\x01'
 PREFIX_SUPPLY = b'\x02'
 PREFIX_TOTAL_SUPPLY = b'\x03'
+PREFIX_ACCOUNT_BALANCE = b'\x04'
 PREFIX_ADMIN = b'\x10'
 PREFIX_PAUSED = b'\x11'
-PREFIX_ORACLE = b'\x12'
-PREFIX_MINTER = b'\x13'
+PREFIX_ROLES = b'\x12'
+# Pre-bitmap minter grants (0x13 + address); folded into PREFIX_ROLES on update
+PREFIX_LEGACY_MINTER = b'\x13'
 PREFIX_PRICE = b'\x20'
 PREFIX_GAS_RESERVE = b'\x21'
 
@@ -45,7 +51,9 @@ TOKEN_SYMBOL: str = "COMPUTE"
 TOKEN_DECIMALS: int = 8
 ONE_TOKEN: int = 100_000_000
 ZERO_ADDRESS: bytes = b'\x00' * 20
-GAS_HASH: bytes = b'\xcf\x76\xe2\x8b\xd0\x06\x2c\x4a\x47\x8e\xe3\x55\x61\x01\x13\x19\xf3\xcf\xa4\xd2'
+MAX_BATCH_SIZE: int = 256
+ROLE_ORACLE: int = 1
+ROLE_MINTER: int = 2
 
 
 # =============================================================================
@@ -65,11 +73,22 @@ def _deploy(data: Any, update: bool) -> None:
         tx = cast(Transaction, script_container)
         deployer = tx.sender
         put(PREFIX_ADMIN, deployer)
-        put_int(PREFIX_PAUSED, 0)
-        put_int(PREFIX_TOTAL_SUPPLY, 0)
-        put_int(PREFIX_GAS_RESERVE, 0)
-        put_int(PREFIX_ORACLE + deployer, 1)
-        put_int(PREFIX_MINTER + deployer, 1)
+        # Paused flag, total supply and GAS reserve start at zero: get_int
+        # already reads a missing key as 0, so they are not written here
+        put_int(PREFIX_ROLES + deployer, ROLE_ORACLE | ROLE_MINTER)
+    else:
+        _migrate_legacy_minters()
+
+
+def _migrate_legacy_minters() -> None:
+    # Oracle grants already live at PREFIX_ROLES (old 0x12, value 1 ==
+    # ROLE_ORACLE); minter grants must be moved or an update revokes them
+    it = find(PREFIX_LEGACY_MINTER)
+    while it.next():
+        legacy_key = cast(bytes, it.value[0])
+        key = PREFIX_ROLES + legacy_key[1:]
+        put_int(key, get_int(key) | ROLE_MINTER)
+        delete(legacy_key)
 
 
 # =============================================================================
@@ -93,8 +112,9 @@ def totalSupply() -> int:
 
 @public(safe=True)
 def balanceOf(owner: UInt160) -> int:
-    assert len(owner) == 20, "Invalid"
-    return get_int(PREFIX_BALANCE + owner)
+    _require_addr(owner)
+    # Per-owner aggregate kept in sync on every balance change: one read
+    return get_int(PREFIX_ACCOUNT_BALANCE + owner)
 
 
 @public(safe=True)
@@ -104,7 +124,8 @@ def tokenSupply(token_id: bytes) -> int:
 
 @public(safe=True)
 def tokensOf(owner: UInt160) -> Iterator:
-    assert len(owner) == 20, "Invalid"
+    _require_addr(owner)
+    # Balance keys are owner-major, so this only scans the owner's tokens
     return find(PREFIX_BALANCE + owner)
 
 
@@ -115,9 +136,15 @@ def tokensOf(owner: UInt160) -> Iterator:
 @public(safe=True)
 def get_current_price(model_id: bytes) -> int:
     """Get spot price for model in GAS units. Safe method."""
-    assert len(model_id) > 0, "Invalid"
-    token_id = CryptoLib.sha256(model_id)
-    return get_int(PREFIX_PRICE + token_id)
+    _require_model(model_id)
+    return _read_price(CryptoLib.sha256(model_id))
+
+
+@public(safe=True)
+def get_price_by_token_id(token_id: bytes) -> int:
+    """Get spot price by token ID (sha256 of model_id). Skips the hash."""
+    _require_token_id(token_id)
+    return _read_price(token_id)
 
 
 @public
@@ -128,14 +155,46 @@ def update_price_oracle(model_id: bytes, price_gas: int) -> bool:
     
     #Update price. Oracle only.
     assert _not_paused(), "Paused"
-    assert len(model_id) > 0, "Invalid"
+    _require_model(model_id)
     assert price_gas > 0, "Invalid"
     assert _is_oracle(calling_script_hash), "Not oracle"
     
-    token_id = CryptoLib.sha256(model_id)
-    put_int(PREFIX_PRICE + token_id, price_gas)
+    _set_price(CryptoLib.sha256(model_id), price_gas)
     return True
+
+
+@public
+def update_price_by_token_id(token_id: bytes, price_gas: int) -> bool:
+    """
+    Same as update_price_oracle, keyed by token ID (sha256 of model_id).
+    Oracles that cache the token ID client-side skip the hash per tick.
+    """
+    assert _not_paused(), "Paused"
+    _require_token_id(token_id)
+    assert price_gas > 0, "Invalid"
+    assert _is_oracle(calling_script_hash), "Not oracle"
     
+    _set_price(token_id, price_gas)
+    return True
+
+
+@public
+def update_prices_batch(model_ids: List[bytes], prices: List[int]) -> bool:
+    """Update a basket of prices; pause and oracle checks run once."""
+    count = len(model_ids)
+    assert count == len(prices), "Invalid"
+    assert count <= MAX_BATCH_SIZE, "Batch too large"
+    assert _not_paused(), "Paused"
+    assert _is_oracle(calling_script_hash), "Not oracle"
+    
+    for i in range(count):
+        model_id = model_ids[i]
+        price_gas = prices[i]
+        _require_model(model_id)
+        assert price_gas > 0, "Invalid"
+        _set_price(CryptoLib.sha256(model_id), price_gas)
+    return True
+
 
 @public(safe=True)
 def get_gas_reserve() -> int:
@@ -148,32 +207,40 @@ def get_gas_reserve() -> int:
 
 @public
 def transfer(from_addr: UInt160, to: UInt160, amount: int, token_id: bytes, data: Any) -> bool:
-    assert len(from_addr) == 20 and len(to) == 20, "Invalid"
-    assert amount > 0, "Invalid"
+    _require_addr(from_addr)
     assert _not_paused(), "Paused"
     assert check_witness(from_addr), "Not authorized"
     
-    from_key = PREFIX_BALANCE + from_addr + token_id
-    from_bal = get_int(from_key)
-    if from_bal < amount:
+    if not _move(PREFIX_BALANCE + from_addr, to, amount, token_id):
         return False
+    _add_account_balance(from_addr, -amount)
+    _notify_transfer(from_addr, to, amount, token_id, data)
+    return True
+
+
+@public
+def transferBatch(from_addr: UInt160, tos: List[UInt160], amounts: List[int], token_ids: List[bytes], data: Any) -> bool:
+    """Move several balances out of one account; pause and witness checked once."""
+    count = len(tos)
+    assert count == len(amounts) and count == len(token_ids), "Invalid"
+    assert count <= MAX_BATCH_SIZE, "Batch too large"
+    _require_addr(from_addr)
+    assert _not_paused(), "Paused"
+    assert check_witness(from_addr), "Not authorized"
     
-    new_from = from_bal - amount
-    if new_from > 0:
-        put_int(from_key, new_from)
-    else:
-        delete(from_key)
-    
-    to_key = PREFIX_BALANCE + to + token_id
-    to_bal = get_int(to_key)
-    put_int(to_key, to_bal + amount)
-    
-    on_transfer(from_addr, to, amount, token_id)
-    
-    contract = ContractManagement.get_contract(to)
-    if contract is not None:
-        call_contract(to, 'onNEP11Payment', [from_addr, amount, token_id, data])
-    
+    # All-or-nothing: a short balance aborts the whole batch. Every state
+    # change lands before the first event/callback, and the sender's
+    # aggregate is debited once for the whole batch.
+    from_prefix = PREFIX_BALANCE + from_addr
+    total = 0
+    for i in range(count):
+        amount = amounts[i]
+        assert _move(from_prefix, tos[i], amount, token_ids[i]), "Insufficient"
+        total += amount
+    _add_account_balance(from_addr, -total)
+    
+    for i in range(count):
+        _notify_transfer(from_addr, tos[i], amounts[i], token_ids[i], data)
     return True
 
 
@@ -184,8 +251,8 @@ def transfer(from_addr: UInt160, to: UInt160, amount: int, token_id: bytes, data
 @public
 def mint(to: UInt160, model_id: bytes, amount: int, quality: int) -> bool:
     assert _not_paused(), "Paused"
-    assert len(to) == 20, "Invalid"
-    assert len(model_id) > 0, "Invalid"
+    _require_addr(to)
+    _require_model(model_id)
     assert amount > 0, "Invalid"
     assert quality >= 50 and quality <= 100, "Invalid quality"
     assert _is_minter(calling_script_hash), "Not minter"
@@ -194,21 +261,38 @@ def mint(to: UInt160, model_id: bytes, amount: int, quality: int) -> bool:
     actual = amount * quality // 100
     assert actual > 0, "Too small"
     
-    # Balance
-    key = PREFIX_BALANCE + to + token_id
-    bal = get_int(key)
-    put_int(key, bal + actual)
-    
-    # Token supply
-    sup_key = PREFIX_SUPPLY + token_id
-    sup = get_int(sup_key)
-    put_int(sup_key, sup + actual)
-    
-    # Total
-    tot = get_int(PREFIX_TOTAL_SUPPLY)
-    put_int(PREFIX_TOTAL_SUPPLY, tot + actual)
+    _mint_tokens(to, token_id, actual)
+    _add_account_balance(to, actual)
+    _add_total_supply(actual)
+    return True
+
+
+@public
+def mint_batch(to: UInt160, model_ids: List[bytes], amounts: List[int], qualities: List[int]) -> bool:
+    """Mint several models to one account; aggregate and total written once."""
+    count = len(model_ids)
+    assert count == len(amounts) and count == len(qualities), "Invalid"
+    assert count <= MAX_BATCH_SIZE, "Batch too large"
+    assert _not_paused(), "Paused"
+    _require_addr(to)
+    assert _is_minter(calling_script_hash), "Not minter"
     
-    on_transfer(UInt160(ZERO_ADDRESS), to, actual, token_id)
+    total = 0
+    for i in range(count):
+        model_id = model_ids[i]
+        amount = amounts[i]
+        quality = qualities[i]
+        _require_model(model_id)
+        assert amount > 0, "Invalid"
+        assert quality >= 50 and quality <= 100, "Invalid quality"
+        
+        actual = amount * quality // 100
+        assert actual > 0, "Too small"
+        _mint_tokens(to, CryptoLib.sha256(model_id), actual)
+        total += actual
+    
+    _add_account_balance(to, total)
+    _add_total_supply(total)
     return True
 
 
@@ -223,19 +307,7 @@ def burn(owner: UInt160, token_id: bytes, amount: int) -> bool:
     if current < amount:
         return False
     
-    new_bal = current - amount
-    if new_bal > 0:
-        put_int(key, new_bal)
-    else:
-        delete(key)
-    
-    sup_key = PREFIX_SUPPLY + token_id
-    sup = get_int(sup_key)
-    put_int(sup_key, sup - amount)
-    
-    tot = get_int(PREFIX_TOTAL_SUPPLY)
-    put_int(PREFIX_TOTAL_SUPPLY, tot - amount)
-    
+    _burn_tokens(owner, key, current, token_id, amount)
     on_transfer(owner, UInt160(ZERO_ADDRESS), amount, token_id)
     return True
 
@@ -247,12 +319,12 @@ def burn(owner: UInt160, token_id: bytes, amount: int) -> bool:
 @public
 def buy_compute(buyer: UInt160, model_id: bytes, gas_amount: int) -> int:
     assert _not_paused(), "Paused"
-    assert len(buyer) == 20, "Invalid"
-    assert len(model_id) > 0, "Invalid"
+    _require_addr(buyer)
+    _require_model(model_id)
     assert gas_amount > 1000, "Too small"
     
     token_id = CryptoLib.sha256(model_id)
-    price = get_int(PREFIX_PRICE + token_id)
+    price = _read_price(token_id)
     assert price > 0, "No price"
     
     fee = gas_amount * 3 // 1000
@@ -260,23 +332,10 @@ def buy_compute(buyer: UInt160, model_id: bytes, gas_amount: int) -> int:
     compute = net * ONE_TOKEN // price
     assert compute > 0, "Too small"
     
-    # Mint
-    key = PREFIX_BALANCE + buyer + token_id
-    bal = get_int(key)
-    put_int(key, bal + compute)
-    
-    sup_key = PREFIX_SUPPLY + token_id
-    sup = get_int(sup_key)
-    put_int(sup_key, sup + compute)
-    
-    tot = get_int(PREFIX_TOTAL_SUPPLY)
-    put_int(PREFIX_TOTAL_SUPPLY, tot + compute)
-    
-    # Reserve
-    res = get_int(PREFIX_GAS_RESERVE)
-    put_int(PREFIX_GAS_RESERVE, res + gas_amount)
-    
-    on_transfer(UInt160(ZERO_ADDRESS), buyer, compute, token_id)
+    _mint_tokens(buyer, token_id, compute)
+    _add_account_balance(buyer, compute)
+    _add_total_supply(compute)
+    _add_gas_reserve(gas_amount)
     return compute
 
 
@@ -284,7 +343,7 @@ def buy_compute(buyer: UInt160, model_id: bytes, gas_amount: int) -> int:
 def sell_compute(seller: UInt160, model_id: bytes, amount: int) -> int:
     assert _not_paused(), "Paused"
     assert check_witness(seller), "Not authorized"
-    assert len(model_id) > 0, "Invalid"
+    _require_model(model_id)
     assert amount > 1000, "Too small"
     
     token_id = CryptoLib.sha256(model_id)
@@ -293,7 +352,7 @@ def sell_compute(seller: UInt160, model_id: bytes, amount: int) -> int:
     current = get_int(key)
     assert current >= amount, "Insufficient"
     
-    price = get_int(PREFIX_PRICE + token_id)
+    price = _read_price(token_id)
     assert price > 0, "No price"
     
     gross = amount * price // ONE_TOKEN
@@ -301,24 +360,10 @@ def sell_compute(seller: UInt160, model_id: bytes, amount: int) -> int:
     net = gross - fee
     assert net > 0, "Too small"
     
-    reserve = get_int(PREFIX_GAS_RESERVE)
-    assert reserve >= net, "Insufficient reserve"
-    
-    # Burn
-    new_bal = current - amount
-    if new_bal > 0:
-        put_int(key, new_bal)
-    else:
-        delete(key)
-    
-    sup_key = PREFIX_SUPPLY + token_id
-    sup = get_int(sup_key)
-    put_int(sup_key, sup - amount)
-    
-    tot = get_int(PREFIX_TOTAL_SUPPLY)
-    put_int(PREFIX_TOTAL_SUPPLY, tot - amount)
+    # Reserve (debited before any external call)
+    _debit_gas_reserve(net)
     
-    put_int(PREFIX_GAS_RESERVE, reserve - net)
+    _burn_tokens(seller, key, current, token_id, amount)
     
     ok = GasToken.transfer(executing_script_hash, seller, net, None)
     assert ok, "Transfer failed"
@@ -333,9 +378,8 @@ def sell_compute(seller: UInt160, model_id: bytes, amount: int) -> int:
 
 @public
 def onNEP17Payment(from_addr: UInt160, amount: int, data: Any) -> None:
-    assert calling_script_hash == UInt160(GAS_HASH), "Only GAS"
-    res = get_int(PREFIX_GAS_RESERVE)
-    put_int(PREFIX_GAS_RESERVE, res + amount)
+    assert calling_script_hash == GasToken.hash, "Only GAS"
+    _add_gas_reserve(amount)
 
 
 @public
@@ -357,7 +401,7 @@ def pause() -> bool:
 @public
 def resume() -> bool:
     assert _is_admin(calling_script_hash), "Not admin"
-    put_int(PREFIX_PAUSED, 0)
+    delete(PREFIX_PAUSED)
     return True
 
 
@@ -369,20 +413,14 @@ def isPaused() -> bool:
 @public
 def set_oracle(addr: UInt160, auth: bool) -> bool:
     assert _is_admin(calling_script_hash), "Not admin"
-    if auth:
-        put_int(PREFIX_ORACLE + addr, 1)
-    else:
-        delete(PREFIX_ORACLE + addr)
+    _set_role(addr, ROLE_ORACLE, auth)
     return True
 
 
 @public
 def set_minter(addr: UInt160, auth: bool) -> bool:
     assert _is_admin(calling_script_hash), "Not admin"
-    if auth:
-        put_int(PREFIX_MINTER + addr, 1)
-    else:
-        delete(PREFIX_MINTER + addr)
+    _set_role(addr, ROLE_MINTER, auth)
     return True
 
 
@@ -407,13 +445,10 @@ def is_minter(addr: UInt160) -> bool:
 @public
 def withdraw_gas(to: UInt160, amount: int) -> bool:
     assert _is_admin(calling_script_hash), "Not admin"
-    assert len(to) == 20, "Invalid"
+    _require_addr(to)
     assert amount > 0, "Invalid"
     
-    reserve = get_int(PREFIX_GAS_RESERVE)
-    assert reserve >= amount, "Insufficient"
-    
-    put_int(PREFIX_GAS_RESERVE, reserve - amount)
+    _debit_gas_reserve(amount)
     ok = GasToken.transfer(executing_script_hash, to, amount, None)
     assert ok, "Failed"
     return True
@@ -423,6 +458,18 @@ def withdraw_gas(to: UInt160, amount: int) -> bool:
 # INTERNAL
 # =============================================================================
 
+def _require_addr(addr: UInt160) -> None:
+    assert len(addr) == 20, "Invalid"
+
+
+def _require_model(model_id: bytes) -> None:
+    assert len(model_id) > 0, "Invalid"
+
+
+def _require_token_id(token_id: bytes) -> None:
+    assert len(token_id) == 32, "Invalid"
+
+
 def _not_paused() -> bool:
     return get_int(PREFIX_PAUSED) == 0
 
@@ -432,8 +479,110 @@ def _is_admin(addr: UInt160) -> bool:
 
 
 def _is_oracle(addr: UInt160) -> bool:
-    return get_int(PREFIX_ORACLE + addr) == 1
+    return (get_int(PREFIX_ROLES + addr) & ROLE_ORACLE) != 0
 
 
 def _is_minter(addr: UInt160) -> bool:
-    return get_int(PREFIX_MINTER + addr) == 1
+    return (get_int(PREFIX_ROLES + addr) & ROLE_MINTER) != 0
+
+
+def _add_gas_reserve(delta: int) -> None:
+    put_int(PREFIX_GAS_RESERVE, get_int(PREFIX_GAS_RESERVE) + delta)
+
+
+def _read_price(token_id: bytes) -> int:
+    return get_int(PREFIX_PRICE + token_id)
+
+
+def _debit_gas_reserve(amount: int) -> None:
+    reserve = get_int(PREFIX_GAS_RESERVE)
+    assert reserve >= amount, "Insufficient reserve"
+    _put_or_delete(PREFIX_GAS_RESERVE, reserve - amount)
+
+
+def _set_price(token_id: bytes, price_gas: int) -> None:
+    key = PREFIX_PRICE + token_id
+    # Oracles often re-post an unchanged price; a read is far cheaper than
+    # the per-byte storage fee of rewriting the same value
+    if get_int(key) != price_gas:
+        put_int(key, price_gas)
+
+
+def _set_role(addr: UInt160, role: int, auth: bool) -> None:
+    # All roles of an address share one bitmap item
+    key = PREFIX_ROLES + addr
+    roles = get_int(key)
+    if auth:
+        roles = roles | role
+    else:
+        roles = roles & ~role
+    _put_or_delete(key, roles)
+
+
+def _move(from_prefix: bytes, to: UInt160, amount: int, token_id: bytes) -> bool:
+    # Caller has already checked pause state and the sender's witness, and
+    # settles the sender's aggregate balance and notifications afterwards.
+    # `from_prefix` is PREFIX_BALANCE + sender, built once per call site.
+    _require_addr(to)
+    assert amount > 0, "Invalid"
+    
+    from_key = from_prefix + token_id
+    from_bal = get_int(from_key)
+    if from_bal < amount:
+        return False
+    
+    _put_or_delete(from_key, from_bal - amount)
+    
+    to_key = PREFIX_BALANCE + to + token_id
+    to_bal = get_int(to_key)
+    put_int(to_key, to_bal + amount)
+    
+    _add_account_balance(to, amount)
+    return True
+
+
+def _notify_transfer(from_addr: UInt160, to: UInt160, amount: int, token_id: bytes, data: Any) -> None:
+    on_transfer(from_addr, to, amount, token_id)
+    
+    contract = ContractManagement.get_contract(to)
+    if contract is not None:
+        call_contract(to, 'onNEP11Payment', [from_addr, amount, token_id, data])
+
+
+def _mint_tokens(to: UInt160, token_id: bytes, amount: int) -> None:
+    # Per-token balance and supply; callers settle the aggregates
+    key = PREFIX_BALANCE + to + token_id
+    put_int(key, get_int(key) + amount)
+    
+    sup_key = PREFIX_SUPPLY + token_id
+    put_int(sup_key, get_int(sup_key) + amount)
+    
+    on_transfer(UInt160(ZERO_ADDRESS), to, amount, token_id)
+
+
+def _burn_tokens(owner: UInt160, key: bytes, current: int, token_id: bytes, amount: int) -> None:
+    # `key`/`current` are the owner's balance key and the value the caller
+    # already read to check it, so the balance is not fetched again
+    _put_or_delete(key, current - amount)
+    _add_account_balance(owner, -amount)
+    
+    sup_key = PREFIX_SUPPLY + token_id
+    _put_or_delete(sup_key, get_int(sup_key) - amount)
+    _add_total_supply(-amount)
+
+
+def _add_total_supply(delta: int) -> None:
+    _put_or_delete(PREFIX_TOTAL_SUPPLY, get_int(PREFIX_TOTAL_SUPPLY) + delta)
+
+
+def _add_account_balance(owner: UInt160, delta: int) -> None:
+    key = PREFIX_ACCOUNT_BALANCE + owner
+    _put_or_delete(key, get_int(key) + delta)
+
+
+def _put_or_delete(key: bytes, value: int) -> None:
+    # Zero is the implicit default of get_int; never store it explicitly
+    if value > 0:
+        put_int(key, value)
+    else:
+        delete(key)
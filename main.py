@@ -4,10 +4,14 @@ Chatten - Decentralized Exchange for AI Compute Tokens
 Main entry point for the Chatten application.
 """
 
+from __future__ import annotations
+
 import asyncio
+import functools
 import os
 import sys
-from typing import Optional
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Callable, Mapping, Optional
 
 # Load environment variables
 try:
@@ -17,61 +21,73 @@ try:
 except ImportError:
     pass  # dotenv not installed, rely on system env vars
 
-# Local imports
-from agents import ChattenTraderAgent
-from tools import (
-    NeoBridgeTool,
-    TokenBalanceTool,
-    TokenTransferTool,
-    QScoreAnalyzerTool,
+# Local imports are deferred to setup_tools/create_agent so that a run which
+# fails config validation exits before loading the agent and tool stacks
+if TYPE_CHECKING:
+    from agents import ChattenTraderAgent
+
+# Read-only application configuration: section -> key -> value
+Config = Mapping[str, Mapping[str, Any]]
+
+
+def _env_flag(value: str) -> bool:
+    """Parse a boolean environment flag ("true", case-insensitive)."""
+    return value.lower() == "true"
+
+
+# (section, key, env var, default, caster); the caster is skipped for unset
+# values without a default so they stay None
+_CONFIG_SCHEMA: tuple[tuple[str, str, str, Optional[str], Optional[Callable[[str], Any]]], ...] = (
+    # Neo N3 Configuration
+    ("neo", "rpc_url", "NEO_RPC_URL", "https://testnet1.neo.coz.io:443", None),
+    ("neo", "network_magic", "NEO_NETWORK_MAGIC", "894710606", int),
+    ("neo", "private_key", "NEO_PRIVATE_KEY", None, None),
+    ("neo", "wallet_address", "NEO_WALLET_ADDRESS", None, None),
+    ("neo", "wallet_path", "NEO_WALLET_PATH", None, None),
+    ("neo", "wallet_password", "NEO_WALLET_PASSWORD", None, None),
+    # Chatten Contract
+    ("contract", "hash", "CHATTEN_CONTRACT_HASH", None, None),
+    ("contract", "owner", "CHATTEN_OWNER_ADDRESS", None, None),
+    # SpoonOS Configuration
+    ("spoon", "api_key", "SPOON_API_KEY", None, None),
+    ("spoon", "workspace_id", "SPOON_WORKSPACE_ID", None, None),
+    ("spoon", "agent_name", "SPOON_AGENT_NAME", "ChattenTrader", None),
+    # OpenAI Configuration
+    ("openai", "api_key", "OPENAI_API_KEY", None, None),
+    ("openai", "model", "OPENAI_MODEL", "gpt-4-turbo-preview", None),
+    ("openai", "temperature", "OPENAI_TEMPERATURE", "0.7", float),
+    # Application Settings
+    ("app", "debug", "DEBUG", "false", _env_flag),
+    ("app", "dry_run", "DRY_RUN", "false", _env_flag),
+    ("app", "log_level", "LOG_LEVEL", "INFO", None),
 )
-from tools.neo_bridge import NeoConfig
 
 
-def get_config() -> dict:
+@functools.lru_cache(maxsize=1)
+def get_config() -> Config:
     """
     Load configuration from environment variables.
 
+    The environment is read once; later calls return the same read-only
+    mapping (call ``get_config.cache_clear()`` to reload).
+
     Returns:
-        dict: Application configuration
+        Mapping: Application configuration
     """
-    return {
-        # Neo N3 Configuration
-        "neo": {
-            "rpc_url": os.getenv("NEO_RPC_URL", "https://testnet1.neo.coz.io:443"),
-            "network_magic": int(os.getenv("NEO_NETWORK_MAGIC", "894710606")),
-            "private_key": os.getenv("NEO_PRIVATE_KEY"),
-            "wallet_address": os.getenv("NEO_WALLET_ADDRESS"),
-            "wallet_path": os.getenv("NEO_WALLET_PATH"),
-            "wallet_password": os.getenv("NEO_WALLET_PASSWORD"),
-        },
-        # Chatten Contract
-        "contract": {
-            "hash": os.getenv("CHATTEN_CONTRACT_HASH"),
-            "owner": os.getenv("CHATTEN_OWNER_ADDRESS"),
-        },
-        # SpoonOS Configuration
-        "spoon": {
-            "api_key": os.getenv("SPOON_API_KEY"),
-            "workspace_id": os.getenv("SPOON_WORKSPACE_ID"),
-            "agent_name": os.getenv("SPOON_AGENT_NAME", "ChattenTrader"),
-        },
-        # OpenAI Configuration
-        "openai": {
-            "api_key": os.getenv("OPENAI_API_KEY"),
-            "model": os.getenv("OPENAI_MODEL", "gpt-4-turbo-preview"),
-            "temperature": float(os.getenv("OPENAI_TEMPERATURE", "0.7")),
-        },
-        # Application Settings
-        "app": {
-            "debug": os.getenv("DEBUG", "false").lower() == "true",
-            "dry_run": os.getenv("DRY_RUN", "false").lower() == "true",
-            "log_level": os.getenv("LOG_LEVEL", "INFO"),
-        },
-    }
+    environ = os.environ
+    config: dict[str, dict[str, Any]] = {}
+    for section, key, env_var, default, caster in _CONFIG_SCHEMA:
+        value = environ.get(env_var, default)
+        if caster is not None and value is not None:
+            value = caster(value)
+        config.setdefault(section, {})[key] = value
+
+    return MappingProxyType(
+        {section: MappingProxyType(values) for section, values in config.items()}
+    )
 
 
-def validate_config(config: dict) -> list[str]:
+def validate_config(config: Config) -> list[str]:
     """
     Validate required configuration values.
 
@@ -100,7 +116,7 @@ def validate_config(config: dict) -> list[str]:
     return errors
 
 
-def setup_tools(config: dict) -> dict:
+def setup_tools(config: Config) -> dict:
     """
     Initialize and configure SpoonOS tools.
 
@@ -110,6 +126,14 @@ def setup_tools(config: dict) -> dict:
     Returns:
         dict: Initialized tools
     """
+    from tools import (
+        NeoBridgeTool,
+        TokenBalanceTool,
+        TokenTransferTool,
+        QScoreAnalyzerTool,
+    )
+    from tools.neo_bridge import NeoConfig
+
     neo_config = NeoConfig(
         rpc_url=config["neo"]["rpc_url"],
         network_magic=config["neo"]["network_magic"],
@@ -130,7 +154,7 @@ def setup_tools(config: dict) -> dict:
     return tools
 
 
-def create_agent(config: dict, tools: Optional[dict] = None) -> ChattenTraderAgent:
+def create_agent(config: Config, tools: Optional[dict] = None) -> ChattenTraderAgent:
     """
     Create and configure the Chatten Trader Agent.
 
@@ -141,6 +165,8 @@ def create_agent(config: dict, tools: Optional[dict] = None) -> ChattenTraderAge
     Returns:
         ChattenTraderAgent: Configured agent instance
     """
+    from agents import ChattenTraderAgent
+
     agent = ChattenTraderAgent(
         name=config["spoon"]["agent_name"],
         neo_wallet_address=config["neo"]["wallet_address"],
@@ -149,7 +175,7 @@ def create_agent(config: dict, tools: Optional[dict] = None) -> ChattenTraderAge
     return agent
 
 
-async def run_agent(agent: ChattenTraderAgent, config: dict) -> None:
+async def run_agent(agent: ChattenTraderAgent, config: Config) -> None:
     """
     Run the agent's main loop.
 
@@ -176,19 +202,23 @@ async def run_agent(agent: ChattenTraderAgent, config: dict) -> None:
         print()
         print("Info: This is a scaffold - implement the TODO items to add functionality.")
 
-        # Demo: quick Q-score snapshot and balance check
-        try:
-            q_score = await agent.analyze_q_score("demo-model")
+        # Demo: quick Q-score snapshot and balance check (independent I/O,
+        # so both run concurrently)
+        demos = [agent.analyze_q_score("demo-model")]
+        if agent.neo_wallet_address:
+            demos.append(agent.check_token_balance())
+        q_score, *position = await asyncio.gather(*demos, return_exceptions=True)
+
+        if isinstance(q_score, BaseException):
+            print(f"Q-score demo skipped: {q_score}")
+        else:
             print(f"Demo Q-score for demo-model: {q_score:.2f}")
-        except Exception as exc:  # pragma: no cover - best effort
-            print(f"Q-score demo skipped: {exc}")
 
-        if agent.neo_wallet_address:
-            try:
-                position = await agent.check_token_balance()
-                print(f"Balance for {agent.neo_wallet_address}: {position.balance} units")
-            except Exception as exc:  # pragma: no cover
-                print(f"Balance demo skipped: {exc}")
+        if position:
+            if isinstance(position[0], BaseException):
+                print(f"Balance demo skipped: {position[0]}")
+            else:
+                print(f"Balance for {agent.neo_wallet_address}: {position[0].balance} units")
 
         print()
 
@@ -241,7 +271,10 @@ async def async_main() -> int:
         return 1
 
     if connected:
-        height = await neo_bridge.get_block_height()
+        # connect() already fetched the height as its health check
+        height = neo_bridge.last_block_height
+        if height is None:
+            height = await neo_bridge.get_block_height()
         print(f"Connected to Neo RPC @ {config['neo']['rpc_url']}")
         print(f"   Current block height: {height}")
     else:
@@ -4,6 +4,9 @@ Tests for ChattenTraderAgent
 
 import pytest
 from agents import ChattenTraderAgent
+from agents.chatten_trader import MarketState
+from tools import TokenBalanceTool, TokenTransferTool
+from tools.neo_bridge import TransactionResult
 
 
 class TestChattenTraderAgent:
@@ -40,3 +43,87 @@ class TestChattenTraderAgent:
         with pytest.raises(NotImplementedError):
             await agent.analyze_q_score("model-123")
 
+    
+    @pytest.mark.asyncio
+    async def test_limit_price_skips_q_score_analysis(self):
+        """Test that an explicit limit price does not require a Q-score lookup."""
+        agent = ChattenTraderAgent()
+        
+        result = await agent.execute_buy_order("model-123", 2, max_price=0.5)
+        
+        assert result.unit_price == 0.5
+        assert result.as_dict()["spent"] == 1.0
+    
+    @pytest.mark.asyncio
+    async def test_zero_limit_price_means_no_limit(self):
+        """Test that a zero limit price falls back to Q-score pricing."""
+        agent = ChattenTraderAgent()
+        
+        with pytest.raises(NotImplementedError):
+            await agent.execute_sell_order("model-123", 10, min_price=0.0)
+    
+    @pytest.mark.asyncio
+    async def test_balance_is_refreshed_after_an_order(self):
+        """Test that a trade invalidates the wallet's cached balance."""
+        class StubBridge:
+            def __init__(self):
+                self.balance = 5
+            
+            async def test_invoke(self, contract_hash, method, params):
+                return {"stack": [{"value": str(self.balance)}]}
+            
+            async def invoke_contract(self, contract_hash, method, params, sign=True):
+                self.balance += 1
+                return TransactionResult(tx_hash="0x01", state="HALT")
+        
+        bridge = StubBridge()
+        agent = ChattenTraderAgent(
+            neo_wallet_address="NAddr1",
+            tools={
+                "token_balance": TokenBalanceTool("0xabc", bridge),
+                "token_transfer": TokenTransferTool("0xabc", bridge),
+            },
+        )
+        
+        assert (await agent.check_token_balance()).balance == 5.0
+        await agent.execute_buy_order("model-123", 1, max_price=0.5)
+        assert (await agent.check_token_balance()).balance == 6.0
+    
+    @pytest.mark.asyncio
+    async def test_startup_balance_failure_is_logged(self, capsys):
+        """Test that a failed balance sync on start is reported, not raised."""
+        agent = ChattenTraderAgent(neo_wallet_address="NAddr1")
+        
+        await agent.on_start()
+        await agent.on_stop()
+        
+        assert "Startup balance sync failed" in capsys.readouterr().out
+    
+    def test_price_book_matches_scalar_pricing(self):
+        """Test that batch pricing agrees with single-order pricing."""
+        agent = ChattenTraderAgent()
+        q_scores = {"low": -5.0, "mid": 50.0, "high": 120.0}
+        
+        book = agent.price_book(q_scores)
+        
+        assert book == {
+            model_id: agent._price_from_q_score(q) for model_id, q in q_scores.items()
+        }
+        assert book["low"] == 0.1
+        assert book["high"] == 1.0
+    
+    def test_nan_q_score_prices_like_the_ceiling(self):
+        """Test that a NaN Q-score keeps the baseline clamp behaviour."""
+        agent = ChattenTraderAgent()
+        
+        assert agent._price_from_q_score(float("nan")) == 1.0
+    
+    def test_price_history_is_bounded(self):
+        """Test that market price history keeps only the most recent entries."""
+        state = MarketState()
+        
+        for i in range(MarketState.HISTORY_CAPACITY + 10):
+            state.price_history.append(float(i))
+        
+        assert len(state.price_history) == MarketState.HISTORY_CAPACITY
+        assert state.price_history[0] == 10.0
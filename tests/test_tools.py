@@ -2,8 +2,11 @@
 Tests for SpoonOS Tools
 """
 
+import asyncio
+
+import httpx
 import pytest
-from tools import NeoBridgeTool, TokenBalanceTool, QScoreAnalyzerTool
+from tools import NeoBridgeTool, TokenBalanceTool, TokenTransferTool, QScoreAnalyzerTool
 from tools.neo_bridge import NeoConfig, TransactionResult
 from tools.market_tools import PerformanceMetrics, QScoreResult, ModelCategory
 
@@ -34,6 +37,41 @@ class TestNeoBridgeTool:
         """Test that tool is not connected on init."""
         tool = NeoBridgeTool()
         assert not tool.is_connected()
+    
+    @pytest.mark.asyncio
+    async def test_shared_session_is_used_and_not_closed(self):
+        """Test that an injected HTTP client is reused and left open."""
+        requests = []
+        
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(200, json={"jsonrpc": "2.0", "id": 1, "result": 42})
+        
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        tool = NeoBridgeTool()
+        await tool.set_session(client)
+        
+        assert await tool.get_block_height() == 42
+        assert requests[0].url.host == "mainnet1.neo.coz.io"
+        
+        await tool.disconnect()
+        assert not client.is_closed
+        await client.aclose()
+    
+    @pytest.mark.asyncio
+    async def test_connect_records_block_height(self):
+        """Test that connect() keeps the height from its health check."""
+        def handler(request):
+            return httpx.Response(200, json={"jsonrpc": "2.0", "id": 1, "result": 42})
+        
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        tool = NeoBridgeTool()
+        await tool.set_session(client)
+        
+        assert tool.last_block_height is None
+        assert await tool.connect()
+        assert tool.last_block_height == 42
+        await client.aclose()
 
 
 class TestTokenBalanceTool:
@@ -47,6 +85,129 @@ class TestTokenBalanceTool:
         
         assert tool.name == "token_balance"
         assert tool.contract_hash == "0x1234567890abcdef"
+    
+    @pytest.mark.asyncio
+    async def test_batch_requests_single_round_trip(self):
+        """Test that queued balance queries are sent as one batch."""
+        class StubBridge:
+            def __init__(self):
+                self.batches = []
+            
+            async def test_invoke_batch(self, calls):
+                self.batches.append(calls)
+                return [{"stack": [{"value": str(i + 5)}]} for i in range(len(calls))]
+        
+        bridge = StubBridge()
+        tool = TokenBalanceTool(contract_hash="0xabc", neo_bridge=bridge)
+        
+        async with tool.batch_requests() as batch:
+            first = batch.get_balance("NAddr1")
+            second = batch.get_balance("NAddr2")
+        
+        assert len(bridge.batches) == 1
+        assert first.result() == 5
+        assert second.result() == 6
+    
+    @pytest.mark.asyncio
+    async def test_balance_queries_are_coalesced(self):
+        """Test that concurrent and repeat balance queries share one RPC."""
+        class StubBridge:
+            def __init__(self):
+                self.calls = 0
+            
+            async def test_invoke(self, contract_hash, method, params):
+                self.calls += 1
+                await asyncio.sleep(0)
+                return {"stack": [{"value": "7"}]}
+        
+        bridge = StubBridge()
+        tool = TokenBalanceTool(contract_hash="0xabc", neo_bridge=bridge)
+        
+        assert await asyncio.gather(
+            tool.get_balance("NAddr1"), tool.get_balance("NAddr1")
+        ) == [7, 7]
+        assert await tool.get_balance("NAddr1") == 7
+        assert bridge.calls == 1
+        
+        tool.BALANCE_TTL_SECONDS = 0.0
+        await tool.get_balance("NAddr1")
+        assert bridge.calls == 2
+    
+    @pytest.mark.asyncio
+    async def test_invalidate_and_foreign_loop_lookups_requery(self):
+        """Test that invalidated or other-loop lookups are not reused."""
+        class StubBridge:
+            def __init__(self):
+                self.calls = 0
+            
+            async def test_invoke(self, contract_hash, method, params):
+                self.calls += 1
+                return {"stack": [{"value": str(self.calls)}]}
+        
+        bridge = StubBridge()
+        tool = TokenBalanceTool(contract_hash="0xabc", neo_bridge=bridge)
+        
+        assert await tool.get_balance("NAddr1") == 1
+        tool.invalidate("NAddr1")
+        assert await tool.get_balance("NAddr1") == 2
+        
+        # A lookup left pending on a different (finished) loop
+        other_loop = asyncio.new_event_loop()
+        try:
+            tool.invalidate()
+            tool._balance_inflight["NAddr1"] = (other_loop, other_loop.create_future())
+            assert await tool.get_balance("NAddr1") == 3
+        finally:
+            other_loop.close()
+    
+    @pytest.mark.asyncio
+    async def test_transfers_invalidate_sender_and_recipient(self):
+        """Test that writes through the transfer tool refresh cached balances."""
+        class StubBridge:
+            def __init__(self):
+                self.balances = {"NSender": 5, "NRecipient": 0, "NOther": 2}
+            
+            def get_address(self):
+                return "NSender"
+            
+            async def test_invoke(self, contract_hash, method, params):
+                return {"stack": [{"value": str(self.balances[params[0]])}]}
+            
+            async def invoke_contract(self, contract_hash, method, params, sign=True):
+                self.balances["NSender"] -= 1
+                self.balances[params[0]] += 1
+                return TransactionResult(tx_hash="0x01", state="HALT")
+        
+        bridge = StubBridge()
+        balances = TokenBalanceTool(contract_hash="0xabc", neo_bridge=bridge)
+        transfers = TokenTransferTool(contract_hash="0xabc", neo_bridge=bridge)
+        for address in bridge.balances:
+            await balances.get_balance(address)
+        
+        await transfers.run(action="transfer", to="NRecipient", token_id="t1")
+        assert await balances.get_balance("NSender") == 4
+        assert await balances.get_balance("NRecipient") == 1
+        
+        await transfers.batch_transfer([{"to": "NOther", "token_id": "t2"}])
+        assert await balances.get_balance("NSender") == 3
+        assert await balances.get_balance("NOther") == 3
+    
+    @pytest.mark.asyncio
+    async def test_batch_transfer_keeps_input_order(self):
+        """Test that concurrent batch transfers return results in order."""
+        class OfflineBridge:
+            async def invoke_contract(self, *args, **kwargs):
+                raise ConnectionError("offline")
+        
+        tool = TokenTransferTool(contract_hash="0xabc", neo_bridge=OfflineBridge())
+        results = await tool.batch_transfer([
+            {"to": "NAddr1", "token_id": "t1"},
+            {"to": "", "token_id": "t2"},
+            {"to": "NAddr3", "token_id": "t3"},
+        ])
+        
+        assert [r["success"] for r in results] == [True, False, True]
+        assert results[0] == await tool.transfer("NAddr1", "t1")
 
 
 class TestQScoreAnalyzerTool:
@@ -67,6 +228,119 @@ class TestQScoreAnalyzerTool:
         assert tool.GOOD_THRESHOLD == 60
         assert tool.MIN_SCORE_FOR_MINT == 50
     
+    @pytest.mark.asyncio
+    async def test_cached_model_ids_tracks_scored_models(self):
+        """Test the cached model ID view reflects scored models."""
+        tool = QScoreAnalyzerTool()
+        ids = tool.cached_model_ids()
+        
+        assert list(ids) == []
+        await tool.calculate_q_score("model-alpha")
+        assert list(ids) == ["model-alpha"]
+    
+    @pytest.mark.asyncio
+    async def test_metrics_cache_is_bounded(self):
+        """Test the metrics cache evicts least recently used models."""
+        tool = QScoreAnalyzerTool()
+        tool.METRICS_CACHE_SIZE = 2
+        tool.SCORE_TTL_SECONDS = 0.0  # always go through the metrics cache
+        
+        await tool.calculate_q_score("model-a")
+        await tool.calculate_q_score("model-b")
+        await tool.calculate_q_score("model-a")
+        await tool.calculate_q_score("model-c")
+        
+        assert list(tool.cached_model_ids()) == ["model-a", "model-c"]
+        assert tool.cache_info() == {"hits": 1, "misses": 3, "size": 2, "maxsize": 2}
+    
+    @pytest.mark.asyncio
+    async def test_evicted_models_leave_the_market_totals(self):
+        """Test that metrics eviction also drops the model's last result."""
+        tool = QScoreAnalyzerTool()
+        tool.METRICS_CACHE_SIZE = 2
+        
+        for model_id in ("model-a", "model-b", "model-c"):
+            await tool.calculate_q_score(model_id)
+        
+        assert set(tool._recent_scores) == set(tool._scored_at) == {"model-b", "model-c"}
+        kept = tool._recent_scores.values()
+        analysis = await tool.get_market_analysis()
+        assert analysis.total_models == 2
+        assert analysis.avg_q_score == round(sum(r.q_score for r in kept) / 2, 2)
+        assert analysis.market_liquidity == sum(r.metrics.sample_size for r in kept)
+    
+    @pytest.mark.asyncio
+    async def test_compare_models_fetches_each_model_once(self):
+        """Test that repeated model IDs share one metrics fetch."""
+        tool = QScoreAnalyzerTool()
+        results = await tool.compare_models(["model-a", "model-b", "model-a"])
+        
+        assert len(results) == 3
+        assert [r.q_score for r in results] == sorted((r.q_score for r in results), reverse=True)
+        assert tool.cache_info()["misses"] == 2
+    
+    @pytest.mark.asyncio
+    async def test_recent_q_score_is_reused(self):
+        """Test that a fresh result is returned without rescoring."""
+        tool = QScoreAnalyzerTool()
+        first = await tool.calculate_q_score("model-a")
+        second = await tool.calculate_q_score("model-a")
+        
+        assert second is first
+        assert tool.cache_info()["hits"] == 0
+        
+        tool.SCORE_TTL_SECONDS = 0.0
+        await tool.calculate_q_score("model-a")
+        assert tool.cache_info()["hits"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_market_analysis_totals_replace_rescored_models(self):
+        """Test market totals count each model's latest result once."""
+        tool = QScoreAnalyzerTool()
+        await tool.calculate_q_score("model-a")
+        await tool.calculate_q_score("model-b")
+        rescored = await tool.calculate_q_score(
+            "model-a", PerformanceMetrics(uptime_percentage=100.0, sample_size=7)
+        )
+        other = tool._recent_scores["model-b"]
+        
+        analysis = await tool.get_market_analysis()
+        assert analysis.total_models == 2
+        assert analysis.avg_q_score == round((rescored.q_score + other.q_score) / 2, 2)
+        assert analysis.market_liquidity == 7 + other.metrics.sample_size
+    
+    @pytest.mark.asyncio
+    async def test_compare_models_reuses_results_for_cached_metrics(self):
+        """Test that unchanged cached metrics are not rescored."""
+        tool = QScoreAnalyzerTool()
+        first = await tool.calculate_q_score("model-a")
+        
+        results = await tool.compare_models(["model-a"])
+        assert results[0] is first
+    
+    @pytest.mark.asyncio
+    async def test_explicit_metrics_are_rescored_after_mutation(self):
+        """Test that caller-supplied metrics are rescored even if reused."""
+        tool = QScoreAnalyzerTool()
+        metrics = PerformanceMetrics(avg_latency_ms=50.0, uptime_percentage=99.9)
+        first = await tool.calculate_q_score("model-a", metrics)
+        
+        metrics.avg_latency_ms = 5000.0
+        metrics.uptime_percentage = 10.0
+        second = await tool.calculate_q_score("model-a", metrics)
+        
+        assert second is not first
+        assert second.q_score == QScoreAnalyzerTool()._score_metrics("x", metrics).q_score
+    
+    def test_score_weights_are_applied(self):
+        """Test that overriding a component weight changes the Q-score."""
+        class LatencyOnly(QScoreAnalyzerTool):
+            LATENCY_WEIGHT = 1.0
+            THROUGHPUT_WEIGHT = QUALITY_WEIGHT = RELIABILITY_WEIGHT = 0.0
+        
+        result = LatencyOnly()._score_metrics("x", PerformanceMetrics(avg_latency_ms=50.0))
+        assert result.q_score == result.latency_score * 4
+    
     def test_performance_metrics_dataclass(self):
         """Test PerformanceMetrics dataclass."""
         metrics = PerformanceMetrics(
@@ -4,12 +4,19 @@ Market Tools
 SpoonOS tools for analyzing market quality and AI model performance.
 """
 
-from typing import Any, Optional
+from typing import Any, KeysView, Optional
+from collections import OrderedDict
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import datetime, timezone
 from enum import Enum
+from operator import attrgetter
+import asyncio
+import bisect
+import functools
 import hashlib
+import heapq
 import random
+import time
 
 # SpoonOS SDK imports
 try:
@@ -21,6 +28,12 @@ except ImportError:
     BaseTool = object
 
 
+@functools.lru_cache(maxsize=4096)
+def _metrics_seed(model_id: str) -> int:
+    """Repeatable 64-bit seed for a model's demo metrics."""
+    return int.from_bytes(hashlib.sha256(model_id.encode()).digest()[:8], "big")
+
+
 class ModelCategory(Enum):
     """Categories of AI models for Q-score calculation."""
     
@@ -31,7 +44,33 @@ class ModelCategory(Enum):
     MULTIMODAL = "multimodal"      # Multimodal Models
 
 
-@dataclass
+# Recommendation flags; bit i selects RECO_MESSAGES[i]
+RECO_LATENCY = 1 << 0
+RECO_THROUGHPUT = 1 << 1
+RECO_QUALITY = 1 << 2
+RECO_RELIABILITY = 1 << 3
+RECO_EXCELLENT = 1 << 4
+RECO_MINT_ELIGIBLE = 1 << 5
+RECO_BELOW_THRESHOLD = 1 << 6
+
+RECO_MESSAGES: tuple[str, ...] = (
+    "Consider optimizing inference latency",
+    "Throughput could be improved with batching",
+    "Model accuracy needs improvement",
+    "Improve uptime and reduce error rates",
+    "Excellent performance - eligible for premium rates",
+    "Good performance - eligible for token minting",
+    "Below threshold - improvements needed before minting",
+)
+
+
+@functools.lru_cache(maxsize=1 << len(RECO_MESSAGES))
+def _reco_messages(flags: int) -> tuple[str, ...]:
+    """Messages selected by a RECO_* flag set (built once per distinct set)."""
+    return tuple(message for i, message in enumerate(RECO_MESSAGES) if flags >> i & 1)
+
+
+@dataclass(slots=True)
 class PerformanceMetrics:
     """Performance metrics for Q-score calculation."""
     
@@ -56,11 +95,18 @@ class PerformanceMetrics:
     cost_per_1k_tokens: float = 0.0
     
     # Metadata
-    measurement_timestamp: Optional[datetime] = None
+    measurement_ts: float = 0.0       # Unix epoch seconds, 0 if unknown
     sample_size: int = 0
+    
+    @property
+    def measurement_timestamp(self) -> Optional[datetime]:
+        """UTC time the metrics were measured, built on read."""
+        if not self.measurement_ts:
+            return None
+        return datetime.fromtimestamp(self.measurement_ts, tz=timezone.utc)
 
 
-@dataclass
+@dataclass(slots=True)
 class QScoreResult:
     """Result of Q-score calculation."""
     
@@ -75,12 +121,17 @@ class QScoreResult:
     quality_score: float = 0.0        # 0-25 max
     reliability_score: float = 0.0    # 0-25 max
     
-    # Recommendations
-    recommendations: list[str] = field(default_factory=list)
+    # Recommendations (RECO_* flags, expanded on access)
+    recommendation_flags: int = 0
     mint_eligible: bool = False
+    
+    @property
+    def recommendations(self) -> tuple[str, ...]:
+        """Recommendation messages selected by recommendation_flags."""
+        return _reco_messages(self.recommendation_flags)
 
 
-@dataclass
+@dataclass(slots=True)
 class MarketAnalysis:
     """Market-wide analysis result."""
     
@@ -126,11 +177,33 @@ class QScoreAnalyzerTool(BaseTool):
     QUALITY_WEIGHT = 0.25
     RELIABILITY_WEIGHT = 0.25
     
+    # Component score tiers: a metric at or under (latency) / at or over
+    # (throughput) a breakpoint earns the matching score; one bisect per lookup
+    _LATENCY_BREAKS = (50, 100, 200, 400, 800)
+    _P95_BREAKS = (100, 200, 400, 800, 1500)
+    _LATENCY_SCORES = (1.0, 0.85, 0.7, 0.5, 0.35, 0.2)
+    _THROUGHPUT_BREAKS = (50, 200, 500, 1000, 2000)
+    _THROUGHPUT_SCORES = (0.2, 0.35, 0.5, 0.7, 0.85, 1.0)
+    
+    # Metrics cache bounds: LRU size cap and per-entry expiry (seconds)
+    METRICS_CACHE_SIZE = 4096
+    METRICS_TTL_SECONDS = 30.0
+    # How long calculate_q_score may return a model's last result unchanged
+    SCORE_TTL_SECONDS = 5.0
+    
     def __init__(self) -> None:
         """Initialize the Q-score Analyzer Tool."""
         super().__init__()
-        self._metrics_cache: dict[str, PerformanceMetrics] = {}
+        # model_id -> (monotonic time cached, metrics), least recently used first
+        self._metrics_cache: OrderedDict[str, tuple[float, PerformanceMetrics]] = OrderedDict()
+        self._cache_hits = 0
+        self._cache_misses = 0
         self._recent_scores: dict[str, QScoreResult] = {}
+        # model_id -> monotonic time its _recent_scores entry was computed
+        self._scored_at: dict[str, float] = {}
+        # Running totals over _recent_scores for get_market_analysis
+        self._score_sum = 0.0
+        self._sample_sum = 0
     
     # =========================================================================
     # Q-SCORE CALCULATION
@@ -159,9 +232,44 @@ class QScoreAnalyzerTool(BaseTool):
         # 3. Apply weights and normalize
         # 4. Generate recommendations
         
-        if metrics is None:
+        fetched = metrics is None
+        if fetched:
+            # A result scored moments ago from cached metrics is still exact
+            cached = self._recent_scores.get(model_id)
+            if (
+                cached is not None
+                and cached.category is category
+                and time.monotonic() - self._scored_at[model_id] < self.SCORE_TTL_SECONDS
+            ):
+                return cached
             metrics = await self._fetch_metrics(model_id)
         
+        return self._score_metrics(model_id, metrics, category, fetched=fetched)
+    
+    def _score_metrics(
+        self,
+        model_id: str,
+        metrics: PerformanceMetrics,
+        category: ModelCategory = ModelCategory.LLM,
+        fetched: bool = False
+    ) -> QScoreResult:
+        """
+        Score already-fetched metrics and record the result.
+        
+        Synchronous: none of the component calculations await. When
+        `fetched` is set, rescoring the cached metrics object a model's
+        last result was built from returns that result. Caller-supplied
+        metrics may have been mutated since, so they are always rescored.
+        """
+        previous = self._recent_scores.get(model_id)
+        if (
+            fetched
+            and previous is not None
+            and previous.metrics is metrics
+            and previous.category is category
+        ):
+            return previous
+        
         latency_score = self._calculate_latency_score(metrics)
         throughput_score = self._calculate_throughput_score(metrics)
         quality_score = self._calculate_quality_score(metrics)
@@ -176,7 +284,7 @@ class QScoreAnalyzerTool(BaseTool):
         
         mint_eligible = q_score >= self.MIN_SCORE_FOR_MINT
         
-        recommendations = self._generate_recommendations(
+        recommendation_flags = self._generate_recommendations(
             q_score, latency_score, throughput_score,
             quality_score, reliability_score
         )
@@ -190,16 +298,47 @@ class QScoreAnalyzerTool(BaseTool):
             throughput_score=throughput_score * 25,
             quality_score=quality_score * 25,
             reliability_score=reliability_score * 25,
-            recommendations=recommendations,
+            recommendation_flags=recommendation_flags,
             mint_eligible=mint_eligible
         )
         
-        # Cache for market-wide aggregation
-        self._metrics_cache[model_id] = metrics
+        # Cache for market-wide aggregation, swapping the model's previous
+        # result out of the running totals
+        if previous is not None:
+            self._score_sum -= previous.q_score
+            self._sample_sum -= previous.metrics.sample_size
+        self._score_sum += q_score
+        self._sample_sum += metrics.sample_size
+        
+        self._cache_metrics(model_id, metrics)
         self._recent_scores[model_id] = result
+        self._scored_at[model_id] = time.monotonic()
         
         return result
     
+    def cached_model_ids(self) -> KeysView[str]:
+        """
+        Return the IDs of models whose metrics are cached.
+        
+        Returns:
+            KeysView: Live view over the metrics cache (no copy is made)
+        """
+        return self._metrics_cache.keys()
+    
+    def cache_info(self) -> dict[str, int]:
+        """
+        Return metrics cache statistics.
+        
+        Returns:
+            dict: Hits, misses, current size and maximum size
+        """
+        return {
+            "hits": self._cache_hits,
+            "misses": self._cache_misses,
+            "size": len(self._metrics_cache),
+            "maxsize": self.METRICS_CACHE_SIZE,
+        }
+    
     async def compare_models(
         self,
         model_ids: list[str]
@@ -213,13 +352,16 @@ class QScoreAnalyzerTool(BaseTool):
         Returns:
             list: Sorted list of QScoreResults (highest first)
         """
-        # TODO: Implement model comparison
-        results = []
-        for model_id in model_ids:
-            result = await self.calculate_q_score(model_id)
-            results.append(result)
-        
-        return sorted(results, key=lambda x: x.q_score, reverse=True)
+        # Fetch all metrics up front (concurrently, once per distinct model);
+        # scoring itself is CPU-only
+        batch = await self._fetch_metrics_batch(model_ids)
+        results = [
+            self._score_metrics(model_id, metrics, fetched=True)
+            for model_id, metrics in zip(model_ids, batch)
+        ]
+        
+        results.sort(key=attrgetter("q_score"), reverse=True)
+        return results
     
     async def get_market_analysis(self) -> MarketAnalysis:
         """
@@ -231,16 +373,17 @@ class QScoreAnalyzerTool(BaseTool):
         if not self._recent_scores:
             return MarketAnalysis()
         
-        scores = list(self._recent_scores.values())
-        total_models = len(scores)
-        avg_q_score = sum(r.q_score for r in scores) / total_models
+        total_models = len(self._recent_scores)
+        avg_q_score = self._score_sum / total_models
         
-        # Top performers by q_score
-        sorted_scores = sorted(scores, key=lambda r: r.q_score, reverse=True)
-        top_performers = [r.model_id for r in sorted_scores[:3]]
+        # Top performers by q_score (partial selection, no full sort)
+        top_scores = heapq.nlargest(
+            3, self._recent_scores.values(), key=attrgetter("q_score")
+        )
+        top_performers = [r.model_id for r in top_scores]
         
         # Simple pseudo-liquidity metric based on sample sizes
-        market_liquidity = sum(r.metrics.sample_size for r in scores)
+        market_liquidity = self._sample_sum
         
         # Trend heuristic: classify based on average score
         if avg_q_score >= self.EXCELLENT_THRESHOLD:
@@ -271,18 +414,12 @@ class QScoreAnalyzerTool(BaseTool):
         latency = metrics.avg_latency_ms or 0.0
         p95 = metrics.p95_latency_ms or latency
         
-        # Fast paths first
-        if latency <= 50 and p95 <= 100:
-            return 1.0
-        if latency <= 100 and p95 <= 200:
-            return 0.85
-        if latency <= 200 and p95 <= 400:
-            return 0.7
-        if latency <= 400 and p95 <= 800:
-            return 0.5
-        if latency <= 800 and p95 <= 1500:
-            return 0.35
-        return 0.2
+        # Both limits of a tier must hold, so the slower of the two wins
+        tier = max(
+            bisect.bisect_left(self._LATENCY_BREAKS, latency),
+            bisect.bisect_left(self._P95_BREAKS, p95),
+        )
+        return self._LATENCY_SCORES[tier]
     
     def _calculate_throughput_score(self, metrics: PerformanceMetrics) -> float:
         """
@@ -293,18 +430,9 @@ class QScoreAnalyzerTool(BaseTool):
         tps = metrics.tokens_per_second or 0.0
         rpm = metrics.requests_per_minute or 0.0
         
-        # Normalize tokens/second to a 0-1 scale with gentle curve
-        if tps >= 2000 or rpm >= 2000:
-            return 1.0
-        if tps >= 1000 or rpm >= 1000:
-            return 0.85
-        if tps >= 500 or rpm >= 500:
-            return 0.7
-        if tps >= 200 or rpm >= 200:
-            return 0.5
-        if tps >= 50 or rpm >= 50:
-            return 0.35
-        return 0.2
+        # Either rate reaching a tier is enough, so the faster one wins
+        tier = bisect.bisect_right(self._THROUGHPUT_BREAKS, max(tps, rpm))
+        return self._THROUGHPUT_SCORES[tier]
     
     def _calculate_quality_score(self, metrics: PerformanceMetrics) -> float:
         """
@@ -346,29 +474,32 @@ class QScoreAnalyzerTool(BaseTool):
         throughput: float,
         quality: float,
         reliability: float
-    ) -> list[str]:
+    ) -> int:
         """
         Generate improvement recommendations based on scores.
+        
+        Returns:
+            int: RECO_* flags (messages are only built when read)
         """
-        recommendations = []
+        flags = 0
         
         if latency < 0.5:
-            recommendations.append("Consider optimizing inference latency")
+            flags |= RECO_LATENCY
         if throughput < 0.5:
-            recommendations.append("Throughput could be improved with batching")
+            flags |= RECO_THROUGHPUT
         if quality < 0.5:
-            recommendations.append("Model accuracy needs improvement")
+            flags |= RECO_QUALITY
         if reliability < 0.5:
-            recommendations.append("Improve uptime and reduce error rates")
+            flags |= RECO_RELIABILITY
         
         if q_score >= self.EXCELLENT_THRESHOLD:
-            recommendations.append("Excellent performance - eligible for premium rates")
+            flags |= RECO_EXCELLENT
         elif q_score >= self.MIN_SCORE_FOR_MINT:
-            recommendations.append("Good performance - eligible for token minting")
+            flags |= RECO_MINT_ELIGIBLE
         else:
-            recommendations.append("Below threshold - improvements needed before minting")
+            flags |= RECO_BELOW_THRESHOLD
         
-        return recommendations
+        return flags
     
     async def _fetch_metrics(self, model_id: str) -> PerformanceMetrics:
         """
@@ -383,11 +514,14 @@ class QScoreAnalyzerTool(BaseTool):
         # In a real deployment this would query an oracle. For the demo we
         # generate deterministic pseudo-metrics so the numbers are stable
         # between runs without needing network access.
-        if model_id in self._metrics_cache:
-            return self._metrics_cache[model_id]
+        entry = self._metrics_cache.get(model_id)
+        if entry is not None and time.monotonic() - entry[0] < self.METRICS_TTL_SECONDS:
+            self._metrics_cache.move_to_end(model_id)
+            self._cache_hits += 1
+            return entry[1]
+        self._cache_misses += 1
         
-        seed = int.from_bytes(hashlib.sha256(model_id.encode()).digest()[:8], "big")
-        rng = random.Random(seed)
+        rng = random.Random(_metrics_seed(model_id))
         
         metrics = PerformanceMetrics(
             avg_latency_ms=round(60 + rng.random() * 500, 2),
@@ -400,48 +534,92 @@ class QScoreAnalyzerTool(BaseTool):
             uptime_percentage=round(96 + rng.random() * 4, 3),
             error_rate=round(rng.random() * 0.05, 4),
             cost_per_1k_tokens=round(0.0005 + rng.random() * 0.002, 6),
-            measurement_timestamp=datetime.utcnow(),
+            measurement_ts=time.time(),
             sample_size=rng.randint(100, 1000),
         )
         
-        self._metrics_cache[model_id] = metrics
+        self._cache_metrics(model_id, metrics)
         return metrics
     
+    async def _fetch_metrics_batch(self, model_ids: list[str]) -> list[PerformanceMetrics]:
+        """
+        Fetch metrics for several models concurrently.
+        
+        Repeated IDs are fetched once.
+        
+        Args:
+            model_ids: Models to fetch metrics for
+            
+        Returns:
+            list: Metrics in the same order as `model_ids`
+        """
+        unique_ids = list(dict.fromkeys(model_ids))
+        fetched = await asyncio.gather(*(self._fetch_metrics(m) for m in unique_ids))
+        by_id = dict(zip(unique_ids, fetched))
+        return [by_id[model_id] for model_id in model_ids]
+    
+    def _cache_metrics(self, model_id: str, metrics: PerformanceMetrics) -> None:
+        """
+        Store metrics as most recently used, evicting the oldest past the cap.
+        
+        An evicted model's last result goes with it, so the score maps and
+        running totals stay bounded by METRICS_CACHE_SIZE as well.
+        """
+        cache = self._metrics_cache
+        cache[model_id] = (time.monotonic(), metrics)
+        cache.move_to_end(model_id)
+        while len(cache) > self.METRICS_CACHE_SIZE:
+            evicted, _ = cache.popitem(last=False)
+            self._forget_score(evicted)
+    
+    def _forget_score(self, model_id: str) -> None:
+        """Drop a model's last result and take it out of the running totals."""
+        result = self._recent_scores.pop(model_id, None)
+        if result is None:
+            return
+        del self._scored_at[model_id]
+        self._score_sum -= result.q_score
+        self._sample_sum -= result.metrics.sample_size
+    
     # =========================================================================
     # TOOL INTERFACE (SpoonOS)
     # =========================================================================
     
     async def run(self, **kwargs: Any) -> ToolResult:
         """SpoonOS tool execution entry point."""
-        action = kwargs.get("action", "calculate")
-        
-        if action == "calculate":
-            model_id = kwargs.get("model_id", "")
-            result = await self.calculate_q_score(model_id)
-            return {
-                "model_id": result.model_id,
-                "q_score": result.q_score,
-                "mint_eligible": result.mint_eligible,
-                "recommendations": result.recommendations
-            }
-        
-        elif action == "compare":
-            model_ids = kwargs.get("model_ids", [])
-            results = await self.compare_models(model_ids)
-            return {
-                "rankings": [
-                    {"model_id": r.model_id, "q_score": r.q_score}
-                    for r in results
-                ]
-            }
-        
-        elif action == "market":
-            analysis = await self.get_market_analysis()
-            return {
-                "total_models": analysis.total_models,
-                "avg_q_score": analysis.avg_q_score,
-                "trend": analysis.price_trend
-            }
-        
-        return {"error": "Unknown action"}
-
+        handler = self._RUN_ACTIONS.get(kwargs.get("action", "calculate"))
+        if handler is None:
+            return {"error": "Unknown action"}
+        return await handler(self, **kwargs)
+    
+    async def _run_calculate(self, **kwargs: Any) -> ToolResult:
+        result = await self.calculate_q_score(kwargs.get("model_id", ""))
+        return {
+            "model_id": result.model_id,
+            "q_score": result.q_score,
+            "mint_eligible": result.mint_eligible,
+            "recommendations": result.recommendations
+        }
+    
+    async def _run_compare(self, **kwargs: Any) -> ToolResult:
+        results = await self.compare_models(kwargs.get("model_ids", []))
+        return {
+            "rankings": [
+                {"model_id": r.model_id, "q_score": r.q_score}
+                for r in results
+            ]
+        }
+    
+    async def _run_market(self, **kwargs: Any) -> ToolResult:
+        analysis = await self.get_market_analysis()
+        return {
+            "total_models": analysis.total_models,
+            "avg_q_score": analysis.avg_q_score,
+            "trend": analysis.price_trend
+        }
+    
+    _RUN_ACTIONS = {
+        "calculate": _run_calculate,
+        "compare": _run_compare,
+        "market": _run_market,
+    }
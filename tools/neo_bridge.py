@@ -38,7 +38,7 @@ except ImportError:
     Transaction = object
 
 
-@dataclass
+@dataclass(slots=True)
 class NeoConfig:
     """Configuration for Neo N3 connection."""
     
@@ -48,7 +48,7 @@ class NeoConfig:
     wallet_password: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class TransactionResult:
     """Result of a Neo N3 transaction."""
     
@@ -89,6 +89,9 @@ class NeoBridgeTool(BaseTool):
     - Invoke smart contracts
     """
     
+    # Maximum number of requests sent in a single JSON-RPC batch
+    MAX_BATCH_SIZE = 20
+    
     def __init__(self, config: Optional[NeoConfig] = None) -> None:
         """
         Initialize the Neo Bridge Tool.
@@ -99,9 +102,12 @@ class NeoBridgeTool(BaseTool):
         super().__init__()
         self.config = config or NeoConfig()
         self._client: Optional[NeoRpcClient] = None
+        self._owns_client = True
         self._facade: Optional[ChainFacade] = None
         self._wallet: Optional[Wallet] = None
         self._account: Optional[Account] = None
+        # Height observed by the last successful connect() health check
+        self.last_block_height: Optional[int] = None
     
     # =========================================================================
     # CONNECTION MANAGEMENT
@@ -115,10 +121,15 @@ class NeoBridgeTool(BaseTool):
             # 打一条 getblockcount 当作健康检查
             result = await self._rpc_call("getblockcount")
             # 如果没有异常，就认为连通
-            return isinstance(result, int) and result > 0
+            if isinstance(result, int) and result > 0:
+                # Keep the height so callers need not re-query it right away
+                self.last_block_height = result
+                return True
+            return False
         except Exception as e:
-            # 失败就清空 client，方便重试
-            self._client = None
+            # 失败就清空 client，方便重试 (a shared client is kept)
+            if self._owns_client:
+                self._client = None
             print(f"[NeoBridge] Failed to connect RPC: {e}")
             return False
     
@@ -126,9 +137,27 @@ class NeoBridgeTool(BaseTool):
         """Close connection to Neo N3 RPC node."""
         if self._client is not None:
             try:
-                await self._client.aclose()  # httpx.AsyncClient.close
+                if self._owns_client:
+                    await self._client.aclose()  # httpx.AsyncClient.close
             finally:
                 self._client = None
+                self._owns_client = True
+    
+    async def set_session(self, client: httpx.AsyncClient) -> None:
+        """
+        Route all subsequent RPC calls through a shared HTTP client.
+        
+        Sharing one client keeps its connection pool (and TLS sessions) warm
+        across every tool. The bridge does not own an injected client:
+        disconnect() only detaches it, closing is left to its creator.
+        
+        Args:
+            client: Shared httpx client (requests are sent to config.rpc_url)
+        """
+        if self._client is not None and self._owns_client:
+            await self._client.aclose()
+        self._client = client
+        self._owns_client = False
     
     def is_connected(self) -> bool:
         """
@@ -233,10 +262,11 @@ class NeoBridgeTool(BaseTool):
         rpc_params = [contract_hash, method, params or []]
         result = await self._rpc_call("invokefunction", rpc_params)
 
-        tx_hash = result.get("txid", "") or result.get("hash", "")
-        gas = float(result.get("gasconsumed", 0.0))
-        state = result.get("state", "HALT")
-        notifications = result.get("notifications", [])
+        get = result.get
+        tx_hash = get("txid") or get("hash") or ""
+        gas = float(get("gasconsumed", 0.0))
+        state = get("state", "HALT")
+        notifications = get("notifications") or []
 
         return TransactionResult(
             tx_hash=tx_hash,
@@ -260,16 +290,36 @@ class NeoBridgeTool(BaseTool):
         result = await self._rpc_call("invokefunction", rpc_params)
         return result
 
-    async def _rpc_call(self, method: str, params: list[Any] | None = None) -> Any:
+    async def test_invoke_batch(
+        self,
+        calls: list[tuple[str, str, list[Any] | None]],
+    ) -> list[dict]:
         """
-        Internal helper to perform a JSON-RPC call to the Neo node.
+        Perform several read-only test invokes in batched round-trips.
+        
+        Args:
+            calls: List of (contract_hash, method, params) tuples
+            
+        Returns:
+            list: invokefunction results in the same order as `calls`
         """
+        return await self._rpc_batch(
+            [("invokefunction", [h, m, p or []]) for h, m, p in calls]
+        )
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Return the HTTP client, creating it on first use."""
         if self._client is None:
             # Lazy init HTTP client
-            self._client = httpx.AsyncClient(
-                base_url=self.config.rpc_url,
-                timeout=10.0,
-            )
+            self._client = httpx.AsyncClient(timeout=10.0)
+            self._owns_client = True
+        return self._client
+
+    async def _rpc_call(self, method: str, params: list[Any] | None = None) -> Any:
+        """
+        Internal helper to perform a JSON-RPC call to the Neo node.
+        """
+        client = self._get_client()
 
         payload = {
             "jsonrpc": "2.0",
@@ -278,7 +328,7 @@ class NeoBridgeTool(BaseTool):
             "id": 1,
         }
 
-        resp = await self._client.post("", json=payload)
+        resp = await client.post(self.config.rpc_url, json=payload)
         resp.raise_for_status()
         data = resp.json()
 
@@ -287,6 +337,43 @@ class NeoBridgeTool(BaseTool):
 
         return data.get("result")
 
+    async def _rpc_batch(self, calls: list[tuple[str, list[Any] | None]]) -> list[Any]:
+        """
+        Perform several JSON-RPC calls using the spec's batch (array) form.
+        
+        Calls are chunked into batches of at most MAX_BATCH_SIZE requests,
+        so N calls cost ceil(N / MAX_BATCH_SIZE) HTTP round-trips.
+        
+        Args:
+            calls: List of (method, params) tuples
+            
+        Returns:
+            list: Results in the same order as `calls`
+        """
+        client = self._get_client()
+        results: list[Any] = []
+
+        for start in range(0, len(calls), self.MAX_BATCH_SIZE):
+            chunk = calls[start:start + self.MAX_BATCH_SIZE]
+            payload = [
+                {"jsonrpc": "2.0", "method": method, "params": params or [], "id": i}
+                for i, (method, params) in enumerate(chunk)
+            ]
+
+            resp = await client.post(self.config.rpc_url, json=payload)
+            resp.raise_for_status()
+            data = resp.json()
+
+            # Responses may arrive in any order; match them back by id
+            by_id = {item.get("id"): item for item in data}
+            for i in range(len(chunk)):
+                item = by_id.get(i, {})
+                if "error" in item:
+                    raise RuntimeError(f"Neo RPC error: {item['error']}")
+                results.append(item.get("result"))
+
+        return results
+
     
     # =========================================================================
     # TOOL INTERFACE (SpoonOS)
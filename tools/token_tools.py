@@ -4,12 +4,16 @@ Token Tools
 SpoonOS tools for interacting with the Chatten NEP-11 token contract.
 """
 
-from typing import Any, Optional
-from dataclasses import dataclass
+from typing import Any, AsyncIterator, Optional
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass
 
+import asyncio
+import functools
 import hashlib
 import random
-from datetime import datetime
+import time
+import weakref
 
 # SpoonOS SDK imports
 try:
@@ -24,7 +28,51 @@ except ImportError:
 from .neo_bridge import NeoBridgeTool, NeoConfig
 
 
-@dataclass
+# Live balance tools, so a write through any TokenTransferTool can drop the
+# cached balances it changes
+_BALANCE_TOOLS: "weakref.WeakSet[TokenBalanceTool]" = weakref.WeakSet()
+
+
+@functools.lru_cache(maxsize=8192)
+def _text_seed(text: str) -> int:
+    """Repeatable 64-bit seed for demo data derived from text."""
+    return int.from_bytes(hashlib.sha256(text.encode()).digest()[:8], "big")
+
+
+@functools.lru_cache(maxsize=8192)
+def _demo_owner(token_id: str) -> str:
+    """Deterministic placeholder owner address for a token."""
+    return f"N{hashlib.sha256(token_id.encode()).hexdigest()[:33]}"
+
+
+@functools.lru_cache(maxsize=4096)
+def _demo_token_ids(address: str) -> tuple[str, ...]:
+    """Deterministic placeholder token IDs for an address (up to three)."""
+    return tuple(
+        hashlib.sha256(f"{address}:{i}".encode()).hexdigest()[:16]
+        for i in range(3)
+    )
+
+
+@functools.lru_cache(maxsize=4096)
+def _demo_token_draws(seed: int) -> tuple[int, int, int, int]:
+    """Seeded demo draws for a token: model number, Q-score, compute units, age (s)."""
+    rng = random.Random(seed)
+    return (
+        rng.randint(100, 999),
+        50 + rng.randint(0, 50),
+        10 + rng.randint(0, 100),
+        rng.randint(0, 86_400),
+    )
+
+
+@functools.lru_cache(maxsize=4096)
+def _fake_tx_hash(prefix: str, target: str, token_id: str) -> str:
+    """Deterministic simulated tx hash for offline demo writes."""
+    return hashlib.sha256(f"{prefix}{target}:{token_id}".encode()).hexdigest()
+
+
+@dataclass(slots=True, frozen=True)
 class TokenInfo:
     """Information about a Compute Token."""
     
@@ -36,6 +84,56 @@ class TokenInfo:
     minted_at: int
 
 
+class BalanceBatch:
+    """
+    Queue of balance queries resolved with batched JSON-RPC round-trips.
+    
+    Created by `TokenBalanceTool.batch_requests()`; queued queries return
+    futures that are resolved when the batch is flushed.
+    """
+    
+    def __init__(self, tool: "TokenBalanceTool") -> None:
+        self._tool = tool
+        self._pending: list[tuple[str, asyncio.Future]] = []
+    
+    def get_balance(self, address: str) -> asyncio.Future:
+        """
+        Queue a balance query for an address.
+        
+        Args:
+            address: Neo N3 address to check
+            
+        Returns:
+            asyncio.Future: Resolves to the balance once the batch is flushed
+        """
+        if not address:
+            raise ValueError("address is required")
+        
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((address, future))
+        return future
+    
+    async def flush(self) -> None:
+        """Send all queued queries and resolve their futures."""
+        pending, self._pending = self._pending, []
+        if not pending:
+            return
+        
+        calls = [
+            (self._tool.contract_hash, "balanceOf", [address])
+            for address, _ in pending
+        ]
+        try:
+            results = await self._tool.neo_bridge.test_invoke_batch(calls)
+            balances = [self._tool._decode_balance_result(r) for r in results]
+        except Exception:
+            # Same offline fallback as TokenBalanceTool.get_balance
+            balances = [self._tool._fake_balance(address) for address, _ in pending]
+        
+        for (_, future), balance in zip(pending, balances):
+            future.set_result(balance)
+
+
 class TokenBalanceTool(BaseTool):
     """
     SpoonOS Tool for checking Compute Token balances.
@@ -52,6 +150,10 @@ class TokenBalanceTool(BaseTool):
     - Get token metadata and properties
     """
     
+    # Balance cache bounds: seconds a balance is reused, max cached addresses
+    BALANCE_TTL_SECONDS = 15.0
+    BALANCE_CACHE_SIZE = 1024
+    
     def __init__(
         self,
         contract_hash: str,
@@ -67,6 +169,15 @@ class TokenBalanceTool(BaseTool):
         super().__init__()
         self.contract_hash = contract_hash
         self.neo_bridge = neo_bridge or NeoBridgeTool()
+        # address -> (monotonic time queried, balance), oldest first
+        self._balance_cache: dict[str, tuple[float, int]] = {}
+        # address -> (event loop, lookup task) for queries still in flight
+        self._balance_inflight: dict[str, tuple[asyncio.AbstractEventLoop, asyncio.Task]] = {}
+        _BALANCE_TOOLS.add(self)
+    
+    async def set_session(self, client: Any) -> None:
+        """Share an HTTP client with the underlying Neo bridge."""
+        await self.neo_bridge.set_session(client)
     
     async def get_balance(self, address: str) -> int:
         """
@@ -81,7 +192,59 @@ class TokenBalanceTool(BaseTool):
         if not address:
             raise ValueError("address is required")
         
-        # Try real RPC first; fall back to deterministic demo data if it fails
+        # Repeat queries within the TTL reuse the last resolved balance
+        cached = self._balance_cache.get(address)
+        if cached is not None and time.monotonic() - cached[0] < self.BALANCE_TTL_SECONDS:
+            return cached[1]
+        
+        # Concurrent queries on the same event loop share one lookup; a task
+        # left pending by another loop is never awaited from this one
+        loop = asyncio.get_running_loop()
+        inflight = self._balance_inflight.get(address)
+        if inflight is None or inflight[0] is not loop:
+            inflight = (loop, loop.create_task(self._load_balance(address)))
+            self._balance_inflight[address] = inflight
+        # Shielded so one caller's cancellation does not cancel the others
+        return await asyncio.shield(inflight[1])
+    
+    def invalidate(self, address: Optional[str] = None) -> None:
+        """
+        Drop cached balances so the next query goes to the chain.
+        
+        TokenTransferTool calls this after every write to the same contract.
+        A lookup already in flight is detached and will not be cached.
+        
+        Args:
+            address: Address to forget, or None to forget every address
+        """
+        if address is None:
+            self._balance_cache.clear()
+            self._balance_inflight.clear()
+        else:
+            self._balance_cache.pop(address, None)
+            self._balance_inflight.pop(address, None)
+    
+    async def _load_balance(self, address: str) -> int:
+        """Query a balance and cache it unless invalidated meanwhile."""
+        task = asyncio.current_task()
+        try:
+            balance = await self._query_balance(address)
+        finally:
+            inflight = self._balance_inflight.get(address)
+            current = inflight is not None and inflight[1] is task
+            if current:
+                del self._balance_inflight[address]
+        
+        if current:
+            cache = self._balance_cache
+            cache.pop(address, None)
+            cache[address] = (time.monotonic(), balance)
+            while len(cache) > self.BALANCE_CACHE_SIZE:
+                del cache[next(iter(cache))]
+        return balance
+    
+    async def _query_balance(self, address: str) -> int:
+        """Query balanceOf over RPC, using demo data if it fails."""
         try:
             result = await self.neo_bridge.test_invoke(
                 self.contract_hash,
@@ -92,6 +255,34 @@ class TokenBalanceTool(BaseTool):
         except Exception:
             return self._fake_balance(address)
     
+    async def get_balances(self, addresses: list[str]) -> list[int]:
+        """
+        Get total token balances for several addresses in one batch.
+        
+        Args:
+            addresses: Neo N3 addresses to check
+            
+        Returns:
+            list: Balances in the same order as `addresses`
+        """
+        async with self.batch_requests() as batch:
+            futures = [batch.get_balance(address) for address in addresses]
+        return [future.result() for future in futures]
+    
+    @asynccontextmanager
+    async def batch_requests(self) -> AsyncIterator[BalanceBatch]:
+        """
+        Collect balance queries and send them as one JSON-RPC batch on exit.
+        
+        Usage:
+            async with tool.batch_requests() as batch:
+                future = batch.get_balance(address)
+            balance = future.result()
+        """
+        batch = BalanceBatch(self)
+        yield batch
+        await batch.flush()
+    
     async def get_tokens(self, address: str) -> list[str]:
         """
         Get all token IDs owned by an address.
@@ -102,13 +293,13 @@ class TokenBalanceTool(BaseTool):
         Returns:
             list: Token IDs owned by the address
         """
-        fake_balance = await self.get_balance(address)
-        rng = random.Random(self._seed(address))
-        tokens = []
-        for i in range(min(3, 1 + fake_balance % 3)):
-            token_id = hashlib.sha256(f"{address}:{i}".encode()).hexdigest()[:16]
-            tokens.append(token_id)
-        return tokens
+        if not address:
+            raise ValueError("address is required")
+        
+        # The IDs are placeholders, so their count comes from the demo balance
+        # rather than a balanceOf round-trip whose value is only used mod 3
+        count = min(3, 1 + self._fake_balance(address) % 3)
+        return list(_demo_token_ids(address)[:count])
     
     async def get_token_info(self, token_id: str) -> Optional[TokenInfo]:
         """
@@ -124,19 +315,15 @@ class TokenBalanceTool(BaseTool):
             return None
         
         owner = await self.get_owner(token_id) or "Nxxxxxxxxxxxxxxxxxxxxxxxxxxxx"
-        rng = random.Random(self._seed(token_id))
-        model_id = f"model-{rng.randint(100, 999)}"
-        q_score = 50 + rng.randint(0, 50)
-        compute_units = 10 + rng.randint(0, 100)
-        minted_at = int(datetime.utcnow().timestamp() - rng.randint(0, 86_400))
+        model_number, q_score, compute_units, age = _demo_token_draws(self._seed(token_id))
         
         return TokenInfo(
             token_id=token_id,
             owner=owner,
-            model_id=model_id,
+            model_id=f"model-{model_number}",
             q_score=q_score,
             compute_units=compute_units,
-            minted_at=minted_at,
+            minted_at=int(time.time() - age),
         )
     
     async def get_owner(self, token_id: str) -> Optional[str]:
@@ -153,8 +340,7 @@ class TokenBalanceTool(BaseTool):
             return None
         
         # Deterministic placeholder owner for the demo
-        h = hashlib.sha256(token_id.encode()).hexdigest()
-        return f"N{h[:33]}"
+        return _demo_owner(token_id)
 
     def _decode_balance_result(self, result: dict) -> int:
         """
@@ -174,24 +360,32 @@ class TokenBalanceTool(BaseTool):
         return (self._seed(address) % 4) + 1
 
     def _seed(self, text: str) -> int:
-        """Create a repeatable seed from input text."""
-        return int.from_bytes(hashlib.sha256(text.encode()).digest()[:8], "big")
+        """Create a repeatable seed from input text (memoized)."""
+        return _text_seed(text)
     
     async def run(self, **kwargs: Any) -> ToolResult:
         """SpoonOS tool execution entry point."""
         action = kwargs.get("action", "balance")
-        address = kwargs.get("address")
-        token_id = kwargs.get("token_id")
-        
-        if action == "balance":
-            return {"balance": await self.get_balance(address or "")}
-        if action == "tokens":
-            return {"tokens": await self.get_tokens(address or "")}
-        if action == "info":
-            info = await self.get_token_info(token_id or "")
-            return info.__dict__ if info else {"error": "Token not found"}
-        
-        return {"error": "Unknown action", "action": action}
+        handler = self._RUN_ACTIONS.get(action)
+        if handler is None:
+            return {"error": "Unknown action", "action": action}
+        return await handler(self, **kwargs)
+    
+    async def _run_balance(self, **kwargs: Any) -> ToolResult:
+        return {"balance": await self.get_balance(kwargs.get("address") or "")}
+    
+    async def _run_tokens(self, **kwargs: Any) -> ToolResult:
+        return {"tokens": await self.get_tokens(kwargs.get("address") or "")}
+    
+    async def _run_info(self, **kwargs: Any) -> ToolResult:
+        info = await self.get_token_info(kwargs.get("token_id") or "")
+        return asdict(info) if info else {"error": "Token not found"}
+    
+    _RUN_ACTIONS = {
+        "balance": _run_balance,
+        "tokens": _run_tokens,
+        "info": _run_info,
+    }
 
 
 class TokenTransferTool(BaseTool):
@@ -210,6 +404,9 @@ class TokenTransferTool(BaseTool):
     - Execute batch transfers
     """
     
+    # Upper bound on transfers batch_transfer keeps in flight at once
+    MAX_CONCURRENT_TRANSFERS = 8
+    
     def __init__(
         self,
         contract_hash: str,
@@ -226,6 +423,10 @@ class TokenTransferTool(BaseTool):
         self.contract_hash = contract_hash
         self.neo_bridge = neo_bridge or NeoBridgeTool()
     
+    async def set_session(self, client: Any) -> None:
+        """Share an HTTP client with the underlying Neo bridge."""
+        await self.neo_bridge.set_session(client)
+    
     async def transfer(
         self,
         to: str,
@@ -260,8 +461,10 @@ class TokenTransferTool(BaseTool):
             }
         except Exception:
             # Deterministic fake tx hash for offline demo mode
-            tx_hash = hashlib.sha256(f"{to}:{token_id}".encode()).hexdigest()
+            tx_hash = _fake_tx_hash("", to, token_id)
             return {"success": True, "tx_hash": tx_hash, "simulated": True}
+        finally:
+            self._invalidate_balances(to)
     
     async def approve(
         self,
@@ -290,48 +493,81 @@ class TokenTransferTool(BaseTool):
             )
             return {"success": result.state == "HALT", "tx_hash": result.tx_hash}
         except Exception:
-            tx_hash = hashlib.sha256(f"approve:{approved}:{token_id}".encode()).hexdigest()
+            tx_hash = _fake_tx_hash("approve:", approved, token_id)
             return {"success": True, "tx_hash": tx_hash, "simulated": True}
+        finally:
+            self._invalidate_balances(approved)
+    
+    def _invalidate_balances(self, counterparty: str) -> None:
+        """
+        Drop cached balances a write to this contract may have changed.
+        
+        The counterparty and the signing wallet are forgotten; if the
+        bridge has no wallet address, every cached balance for the
+        contract is dropped instead.
+        """
+        get_address = getattr(self.neo_bridge, "get_address", None)
+        sender = get_address() if get_address is not None else None
+        for tool in list(_BALANCE_TOOLS):
+            if tool.contract_hash != self.contract_hash:
+                continue
+            if sender is None:
+                tool.invalidate()
+            else:
+                tool.invalidate(sender)
+                tool.invalidate(counterparty)
     
     async def batch_transfer(
         self,
         transfers: list[dict]
     ) -> list[dict]:
         """
-        Execute multiple transfers in sequence.
+        Execute multiple transfers concurrently.
+        
+        Each transfer is an independent contract invocation, so their RPC
+        round-trips overlap instead of running back to back; at most
+        MAX_CONCURRENT_TRANSFERS are in flight to respect node rate limits.
         
         Args:
             transfers: List of {to, token_id, data} dicts
             
         Returns:
-            list: Results for each transfer
+            list: Results for each transfer, in input order
         """
-        results = []
-        for item in transfers:
-            results.append(
-                await self.transfer(
+        limit = asyncio.Semaphore(self.MAX_CONCURRENT_TRANSFERS)
+        
+        async def transfer_one(item: dict) -> dict:
+            async with limit:
+                return await self.transfer(
                     item.get("to", ""),
                     item.get("token_id", ""),
                     item.get("data"),
                 )
-            )
-        return results
+        
+        return await asyncio.gather(*(transfer_one(item) for item in transfers))
     
     async def run(self, **kwargs: Any) -> ToolResult:
         """SpoonOS tool execution entry point."""
-        action = kwargs.get("action", "transfer")
-        
-        if action == "transfer":
-            return await self.transfer(
-                kwargs.get("to", ""),
-                kwargs.get("token_id", ""),
-                kwargs.get("data")
-            )
-        elif action == "approve":
-            return await self.approve(
-                kwargs.get("approved", ""),
-                kwargs.get("token_id", "")
-            )
-        
-        return {"error": "Unknown action"}
+        handler = self._RUN_ACTIONS.get(kwargs.get("action", "transfer"))
+        if handler is None:
+            return {"error": "Unknown action"}
+        return await handler(self, **kwargs)
+    
+    async def _run_transfer(self, **kwargs: Any) -> ToolResult:
+        return await self.transfer(
+            kwargs.get("to", ""),
+            kwargs.get("token_id", ""),
+            kwargs.get("data")
+        )
+    
+    async def _run_approve(self, **kwargs: Any) -> ToolResult:
+        return await self.approve(
+            kwargs.get("approved", ""),
+            kwargs.get("token_id", "")
+        )
+    
+    _RUN_ACTIONS = {
+        "transfer": _run_transfer,
+        "approve": _run_approve,
+    }
 